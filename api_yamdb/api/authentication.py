@@ -0,0 +1,89 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+ROLE_CLAIMS = ('username', 'role', 'is_superuser', 'is_staff')
+SNAPSHOT_FIELDS = ('id', *ROLE_CLAIMS, 'is_active')
+
+
+def get_user_cache():
+    return caches[settings.AUTH_USER_CACHE_ALIAS]
+
+
+def user_cache_key(user_id):
+    return f'auth-user:{user_id}'
+
+
+def forget_user(user_id):
+    get_user_cache().delete(user_cache_key(user_id))
+
+
+def get_access_token(user):
+    """
+    Выпускает access-токен пользователя.
+
+    При включённой настройке JWT_ROLE_CLAIMS в токен добавляются роль
+    и флаги прав, чтобы проверять доступ без загрузки пользователя:
+    is_admin и is_moderator вычисляются по роли.
+    """
+    token = AccessToken.for_user(user)
+    if settings.JWT_ROLE_CLAIMS:
+        for claim in ROLE_CLAIMS:
+            token[claim] = getattr(user, claim)
+    return token
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация с кэшированием пользователя.
+
+    Снимок полей, нужных для проверки прав, берётся из claims токена,
+    а если их нет, из кэша. Остальные поля пользователя отложены и
+    загружаются при первом обращении.
+    """
+
+    def get_snapshot_fields(self):
+        return [
+            field.attname for field in self.user_model._meta.concrete_fields
+            if field.attname in SNAPSHOT_FIELDS
+        ]
+
+    def build_user(self, fields, values):
+        return self.user_model.from_db(
+            router.db_for_read(self.user_model), fields, values
+        )
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        fields = self.get_snapshot_fields()
+        if all(claim in validated_token for claim in ROLE_CLAIMS):
+            claims = {
+                'id': user_id,
+                'is_active': True,
+                **{claim: validated_token[claim] for claim in ROLE_CLAIMS}
+            }
+            return self.build_user(
+                fields, [claims[field] for field in fields]
+            )
+        cache = get_user_cache()
+        values = cache.get(user_cache_key(user_id))
+        if values is None:
+            user = super().get_user(validated_token)
+            cache.set(
+                user_cache_key(user_id),
+                [getattr(user, field) for field in fields],
+                timeout=settings.AUTH_USER_CACHE_TIMEOUT
+            )
+            return user
+        user = self.build_user(fields, values)
+        if not user.is_active:
+            raise AuthenticationFailed(
+                'Пользователь неактивен.', code='user_inactive'
+            )
+        return user
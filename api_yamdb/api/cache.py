@@ -0,0 +1,87 @@
+import hashlib
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+KEY_PREFIX = 'api-response'
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def version_key(name):
+    return f'{KEY_PREFIX}:version:{name}'
+
+
+def title_version_name(title_id):
+    return f'title:{title_id}'
+
+
+def review_version_name(review_id):
+    return f'review:{review_id}'
+
+
+def build_etag(request, versions):
+    raw = f'{build_response_key(request)}:{sorted(versions.items())}'
+    return f'"{hashlib.md5(raw.encode()).hexdigest()}"'
+
+
+def get_versions(names):
+    """
+    Возвращает текущие версии групп кэша.
+
+    Отсутствующие версии создаются заново, поэтому вытеснение или
+    истечение ключа версии делает зависящие от неё ответы и ETag
+    устаревшими.
+    """
+    cache = get_cache()
+    keys = {version_key(name): name for name in names}
+    found = cache.get_many(keys)
+    missing = {key: uuid4().hex for key in keys if key not in found}
+    if missing:
+        cache.set_many(
+            missing, timeout=settings.RESPONSE_CACHE_VERSION_TIMEOUT
+        )
+        found.update(missing)
+    return {keys[key]: value for key, value in found.items()}
+
+
+def bump_versions(*names):
+    """Сбрасывает ответы, зависящие от групп, после коммита транзакции."""
+    def bump():
+        get_cache().set_many(
+            {version_key(name): uuid4().hex for name in names},
+            timeout=settings.RESPONSE_CACHE_VERSION_TIMEOUT
+        )
+    transaction.on_commit(bump)
+
+
+def build_response_key(request):
+    query = sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+    )
+    raw = f'{request.path}?{query}'.encode()
+    return f'{KEY_PREFIX}:response:{hashlib.md5(raw).hexdigest()}'
+
+
+def get_response_data(request):
+    entry = get_cache().get(build_response_key(request))
+    if entry is None:
+        return None
+    dependencies, data = entry
+    if get_versions(dependencies) != dependencies:
+        return None
+    return data
+
+
+def set_response_data(request, data, dependencies):
+    get_cache().set(
+        build_response_key(request),
+        (dependencies, data),
+        timeout=settings.RESPONSE_CACHE_TIMEOUT
+    )
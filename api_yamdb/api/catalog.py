@@ -0,0 +1,100 @@
+import threading
+import time
+
+from django.conf import settings
+
+from api.cache import get_versions
+from reviews.models import Category, Genre
+
+CATALOG_GROUPS = ('categories', 'genres')
+
+
+class CatalogEntries:
+    """Объекты одной модели справочника по id и по slug."""
+
+    def __init__(self, objects):
+        self.by_id = {obj.pk: obj for obj in objects}
+        self.by_slug = {obj.slug: obj for obj in objects}
+
+
+class Catalog:
+    """
+    Справочник категорий и жанров в памяти процесса.
+
+    Снимок помечен версиями групп кэша `categories` и `genres`, которые
+    меняют сигналы при изменении моделей. При смене версий, а также не
+    реже раза в CATALOG_MAX_AGE секунд снимок перечитывается из базы
+    данных: версии в локальном кэше другого процесса не меняются.
+    Промах по id или slug перечитывает снимок не чаще раза в
+    CATALOG_MISS_RELOAD_INTERVAL секунд.
+    """
+
+    models = (Category, Genre)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.versions = None
+        self.entries = {}
+        self.loaded_at = None
+        self.miss_reloaded_at = None
+
+    def reload(self, versions):
+        with self.lock:
+            self.entries = {
+                model: CatalogEntries(list(model.objects.all()))
+                for model in self.models
+            }
+            self.versions = versions
+            self.loaded_at = time.monotonic()
+
+    def invalidate(self):
+        """Снимок будет перечитан при следующем обращении."""
+        self.versions = None
+
+    def is_expired(self):
+        return (
+            self.loaded_at is None
+            or time.monotonic() - self.loaded_at > settings.CATALOG_MAX_AGE
+        )
+
+    def reload_on_miss(self):
+        """Перечитывает снимок при промахе, если интервал истёк."""
+        now = time.monotonic()
+        if (self.miss_reloaded_at is not None
+                and now - self.miss_reloaded_at
+                < settings.CATALOG_MISS_RELOAD_INTERVAL):
+            return False
+        self.miss_reloaded_at = now
+        self.reload(self.versions)
+        return True
+
+    def get_entries(self):
+        versions = get_versions(CATALOG_GROUPS)
+        if versions != self.versions or self.is_expired():
+            self.reload(versions)
+        return self.entries
+
+    def get(self, model, pk):
+        """
+        Объект по id.
+
+        Если объекта нет и в перечитанном снимке, он загружается из
+        базы данных отдельно.
+        """
+        obj = self.get_entries()[model].by_id.get(pk)
+        if obj is None and self.reload_on_miss():
+            obj = self.entries[model].by_id.get(pk)
+        if obj is None:
+            obj = model.objects.filter(pk=pk).first()
+        return obj
+
+    def get_by_slugs(self, model, slugs):
+        """Объекты по slug в порядке запроса, неизвестные slug пропускаются."""
+        by_slug = self.get_entries()[model].by_slug
+        if (any(slug not in by_slug for slug in slugs)
+                and self.reload_on_miss()):
+            by_slug = self.entries[model].by_slug
+        return [by_slug[slug] for slug in slugs if slug in by_slug]
+
+
+catalog = Catalog()
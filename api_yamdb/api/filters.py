@@ -1,22 +1,80 @@
+from django.db.models import Count
 from django_filters import rest_framework as filters
 
-from reviews.models import Title
+from api.catalog import catalog
+from reviews.models import Category, Genre, Title
+from reviews.search import get_title_search
+
+MATCH_ANY = 'any'
+MATCH_ALL = 'all'
 
 
 class TitlesFilter(filters.FilterSet):
+    """
+    Фильтр произведений.
+
+    `genre` и `category` принимают точные slug через запятую: slug
+    переводятся в id по справочнику catalog, а произведения выбираются по
+    индексированным внешним ключам. `genre_match=all` оставляет только
+    произведения со всеми жанрами. Поиск по части slug включается
+    параметрами `genre__icontains` и `category__icontains`. Диапазоны
+    года и рейтинга задаются параметрами `year_min`/`year_max` и
+    `rating_min`/`rating_max`.
+    """
+
     name = filters.CharFilter(
         field_name='name',
         lookup_expr='icontains'
     )
-    category = filters.CharFilter(
+    category = filters.CharFilter(method='filter_category')
+    category__icontains = filters.CharFilter(
         field_name='category__slug',
         lookup_expr='icontains'
     )
-    genre = filters.CharFilter(
+    genre = filters.CharFilter(method='filter_genre')
+    genre__icontains = filters.CharFilter(
         field_name='genre__slug',
         lookup_expr='icontains'
     )
+    genre_match = filters.ChoiceFilter(
+        choices=((MATCH_ANY, 'Любой из жанров'), (MATCH_ALL, 'Все жанры')),
+        method='filter_genre_match'
+    )
+
+    year_min = filters.NumberFilter(field_name='year', lookup_expr='gte')
+    year_max = filters.NumberFilter(field_name='year', lookup_expr='lte')
+    rating_min = filters.NumberFilter(field_name='rating', lookup_expr='gte')
+    rating_max = filters.NumberFilter(field_name='rating', lookup_expr='lte')
+
+    search = filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('name', 'year', 'genre', 'category')
+        fields = ('name', 'year', 'genre', 'category', 'search')
+
+    def get_ids(self, model, value):
+        slugs = {slug.strip() for slug in value.split(',') if slug.strip()}
+        return slugs, [obj.pk for obj in catalog.get_by_slugs(model, slugs)]
+
+    def filter_category(self, queryset, name, value):
+        _, category_ids = self.get_ids(Category, value)
+        return queryset.filter(category_id__in=category_ids)
+
+    def filter_genre(self, queryset, name, value):
+        slugs, genre_ids = self.get_ids(Genre, value)
+        links = Title.genre.through.objects.filter(genre_id__in=genre_ids)
+        if self.form.cleaned_data.get('genre_match') == MATCH_ALL:
+            if len(genre_ids) < len(slugs):
+                return queryset.none()
+            links = links.values('title_id').annotate(
+                genres=Count('genre_id')
+            ).filter(genres=len(genre_ids))
+        return queryset.filter(pk__in=links.values('title_id'))
+
+    def filter_genre_match(self, queryset, name, value):
+        """Режим учитывается в filter_genre."""
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        """Полнотекстовый поиск по названию и описанию с ранжированием."""
+        return get_title_search().search(queryset, value)
@@ -1,14 +1,155 @@
-from rest_framework import mixins, viewsets
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
+from api import cache
 from api.permissions import IsAdminOrReadOnly
+from api.serializers import ReadOnlyTitleSerializer
+from reviews.models import Title
 
 
 ALLOWED_METHODS = ('get', 'post', 'patch', 'delete')
 
 
+class CachedListMixin:
+    """
+    Кэширует ответы на GET-запросы анонимных пользователей к списку.
+
+    Ответ хранится вместе с версиями групп из `get_cache_groups` и
+    объектов из `get_cache_dependencies`, изменение любой из них делает
+    его устаревшим.
+    """
+
+    cache_groups = ()
+
+    def get_cache_groups(self):
+        return self.cache_groups
+
+    def get_cache_dependencies(self, data):
+        return ()
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+        data = cache.get_response_data(request)
+        if data is not None:
+            return Response(data)
+        versions = cache.get_versions(self.get_cache_groups())
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            versions.update(
+                cache.get_versions(self.get_cache_dependencies(response.data))
+            )
+            cache.set_response_data(request, response.data, versions)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class CachedResponseMixin(CachedListMixin):
+    """Кэширует ответы анонимным пользователям на список и объект."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalGetMixin:
+    """
+    Поддержка условных GET-запросов через ETag.
+
+    ETag строится по версиям из `get_etag_dependencies` без обращения
+    к базе данных, поэтому ответ 304 не требует сериализации.
+    Если зависимости равны None, ETag не используется.
+    """
+
+    def get_etag_dependencies(self):
+        return None
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        dependencies = self.get_etag_dependencies()
+        if dependencies is None:
+            return handler(request, *args, **kwargs)
+        etag = cache.build_etag(request, cache.get_versions(dependencies))
+        conditional = get_conditional_response(request, etag=etag)
+        if conditional is not None:
+            # 304 для If-None-Match или 412 для несовпавшего If-Match.
+            headers = {}
+            if conditional.status_code == status.HTTP_304_NOT_MODIFIED:
+                headers['ETag'] = etag
+            return Response(
+                status=conditional.status_code, headers=headers
+            )
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class NestedResourceMixin:
+    """
+    Родительский объект вложенного ресурса.
+
+    `parent_lookups` сопоставляет поля родительской модели с
+    параметрами URL. Все параметры проверяются одним запросом, а
+    найденный объект сохраняется на время обработки запроса.
+    """
+
+    parent_model = None
+    parent_lookups = {}
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(
+                self.parent_model,
+                **{
+                    field: self.kwargs.get(kwarg)
+                    for field, kwarg in self.parent_lookups.items()
+                }
+            )
+        return self._parent
+
+
+class TopTitlesMixin:
+    """
+    Лучшие произведения жанра или категории по `{slug}/top/`.
+
+    Список берётся из заранее пересобранной таблицы TopTitle, поле
+    группы задаётся в `top_titles_field`.
+    """
+
+    top_titles_field = None
+
+    @action(detail=True, methods=('get',))
+    def top(self, request, slug=None):
+        group = self.get_object()
+        titles = Title.objects.filter(**{
+            f'top_positions__{self.top_titles_field}': group
+        }).with_genre_ids().order_by('top_positions__position')
+        return Response(ReadOnlyTitleSerializer(titles, many=True).data)
+
+
 class CategoryGenreBaseViewSet(
+    TopTitlesMixin,
+    CachedListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -4,12 +4,21 @@ from rest_framework import permissions
 User = get_user_model()
 
 
-class IsAdmin(permissions.BasePermission):
-    """Доступ только для админов или суперюзеров."""
+class IsAdminInDatabase(permissions.BasePermission):
+    """
+    Доступ только для админов или суперюзеров по данным из базы.
+
+    Для управления пользователями и ролями: роль в токене может быть
+    устаревшей.
+    """
 
     def has_permission(self, request, view):
-        return request.user.is_authenticated and (
-            request.user.is_admin or request.user.is_superuser)
+        if not request.user.is_authenticated:
+            return False
+        user = User.objects.filter(pk=request.user.pk).only(
+            'role', 'is_superuser', 'is_staff'
+        ).first()
+        return user is not None and (user.is_admin or user.is_superuser)
 
 
 class IsAdminOrReadOnly(permissions.BasePermission):
@@ -1,8 +1,8 @@
 from django.conf import settings
-from django.shortcuts import get_object_or_404
+from django.utils.encoding import smart_str
 from rest_framework import serializers
-from rest_framework.exceptions import ValidationError
 
+from api.catalog import catalog
 from reviews.models import Category, Comment, Genre, Review, Title
 from users.validators import validate_username
 from users.models import User
@@ -19,23 +19,20 @@ class CommentSerializer(serializers.ModelSerializer):
 
 
 class ReviewSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор отзыва.
+
+    Единственность отзыва пользователя на произведение проверяет
+    ограничение `unique review` при вставке, см. ReviewViewSet.
+    """
+
+    unique_review_message = 'Должен быть только один отзыв от пользователя.'
+
     author = serializers.SlugRelatedField(
         slug_field='username',
         read_only=True
     )
 
-    def validate(self, data):
-        request = self.context['request']
-        if request.method != 'POST':
-            return data
-        title_id = self.context.get('view').kwargs.get('title_pk')
-        title = get_object_or_404(Title, pk=title_id)
-        if Review.objects.filter(title=title, author=request.user).exists():
-            raise ValidationError(
-                'Должен быть только один отзыв от пользователя.'
-            )
-        return data
-
     class Meta:
         exclude = ('title',)
         model = Review
@@ -55,13 +52,60 @@ class GenreSerializer(serializers.ModelSerializer):
         lookup_field = 'slug'
 
 
+class CatalogSlugRelatedField(serializers.SlugRelatedField):
+    """Поиск категории или жанра по slug в справочнике catalog."""
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        objects = catalog.get_by_slugs(self.queryset.model, (data,))
+        if not objects:
+            self.fail(
+                'does_not_exist',
+                slug_name=self.slug_field,
+                value=smart_str(data)
+            )
+        return objects[0]
+
+
+class CatalogRelatedField(serializers.Field):
+    """
+    Категория или жанры произведения из справочника catalog.
+
+    Для категории источником служит `category_id`, для жанров нужны
+    только id из prefetch_related, сами объекты берутся из справочника.
+    """
+
+    def __init__(self, model, serializer_class, many=False, **kwargs):
+        kwargs['read_only'] = True
+        self.model = model
+        self.serializer_class = serializer_class
+        self.many = many
+        super().__init__(**kwargs)
+
+    def get_object(self, pk):
+        # Один снимок справочника на весь ответ.
+        entries = getattr(self.root, '_catalog_entries', None)
+        if entries is None:
+            entries = self.root._catalog_entries = catalog.get_entries()
+        obj = entries[self.model].by_id.get(pk)
+        if obj is None:
+            obj = catalog.get(self.model, pk)
+        return self.serializer_class(obj).data
+
+    def to_representation(self, value):
+        if self.many:
+            return [self.get_object(obj.pk) for obj in value.all()]
+        return self.get_object(value)
+
+
 class EditTitleSerializer(serializers.ModelSerializer):
-    genre = serializers.SlugRelatedField(
+    genre = CatalogSlugRelatedField(
         slug_field='slug',
         many=True,
         queryset=Genre.objects.all()
     )
-    category = serializers.SlugRelatedField(
+    category = CatalogSlugRelatedField(
         slug_field='slug',
         queryset=Category.objects.all()
     )
@@ -86,11 +130,10 @@ class ReadOnlyTitleSerializer(serializers.ModelSerializer):
         read_only=True,
         default=None
     )
-    genre = GenreSerializer(
-        many=True,
-        read_only=True
+    genre = CatalogRelatedField(Genre, GenreSerializer, many=True)
+    category = CatalogRelatedField(
+        Category, CategorySerializer, source='category_id'
     )
-    category = CategorySerializer(read_only=True)
 
     class Meta:
         model = Title
@@ -0,0 +1,55 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.authentication import forget_user
+from api.cache import bump_versions, review_version_name, title_version_name
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+
+@receiver((post_save, post_delete), sender=Category)
+def invalidate_categories(sender, **kwargs):
+    bump_versions('categories')
+
+
+@receiver((post_save, post_delete), sender=Genre)
+def invalidate_genres(sender, **kwargs):
+    bump_versions('genres')
+
+
+@receiver((post_save, post_delete), sender=Title)
+def invalidate_titles(sender, instance, **kwargs):
+    bump_versions('titles', title_version_name(instance.pk))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, instance, action, reverse, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        bump_versions('titles')
+    else:
+        bump_versions(title_version_name(instance.pk))
+
+
+@receiver((post_save, post_delete), sender=Review)
+def invalidate_title_reviews(sender, instance, **kwargs):
+    bump_versions('ratings', title_version_name(instance.title_id))
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def invalidate_review_comments(sender, instance, **kwargs):
+    bump_versions(review_version_name(instance.review_id))
+
+
+@receiver(post_save, sender=User)
+def invalidate_authors(sender, created, **kwargs):
+    if not created:
+        bump_versions('authors')
+
+
+@receiver((post_save, post_delete), sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: forget_user(user_id))
@@ -0,0 +1,68 @@
+import hashlib
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class AuthRateThrottle(SimpleRateThrottle):
+    """
+    Ограничение частоты запросов к эндпоинтам регистрации и токена.
+
+    Счётчики хранятся в кэше THROTTLE_CACHE_ALIAS, поэтому лишние
+    запросы отклоняются до обращения к базе данных.
+    """
+
+    cache = caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request)
+        }
+
+
+class AuthBurstRateThrottle(AuthRateThrottle):
+    """Кратковременные всплески запросов с одного IP."""
+
+    scope = 'auth_burst'
+
+
+class AuthSustainedRateThrottle(AuthRateThrottle):
+    """Длительная нагрузка с одного IP."""
+
+    scope = 'auth_sustained'
+
+
+class AuthIdentityRateThrottle(AuthRateThrottle):
+    """
+    Запросы для одного username или email с любых IP.
+
+    Ключом служит хэш значения поля, запросы без поля не ограничиваются.
+    Тело запроса, не являющееся словарём, отклоняет сериализатор.
+    """
+
+    field = None
+
+    def get_cache_key(self, request, view):
+        if not isinstance(request.data, Mapping):
+            return None
+        value = request.data.get(self.field)
+        if not value:
+            return None
+        ident = hashlib.md5(str(value).strip().lower().encode()).hexdigest()
+        return self.cache_format % {
+            'scope': f'{self.scope}:{self.field}',
+            'ident': ident
+        }
+
+
+class AuthUsernameRateThrottle(AuthIdentityRateThrottle):
+    scope = 'auth_identity'
+    field = 'username'
+
+
+class AuthEmailRateThrottle(AuthIdentityRateThrottle):
+    scope = 'auth_identity'
+    field = 'email'
@@ -2,8 +2,8 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from api.views import (AdminUserViewSet, CategoryViewSet, CommentViewSet,
-                       GenreViewSet, RegisterViewSet, ReviewViewSet,
-                       TitleViewSet, TokenJWTViewSet)
+                       ExportViewSet, GenreViewSet, RegisterViewSet,
+                       ReviewViewSet, TitleViewSet, TokenJWTViewSet)
 
 v1_router = DefaultRouter()
 
@@ -42,5 +42,10 @@ auth_patterns = [
 
 urlpatterns = [
     path('v1/auth/', include(auth_patterns)),
+    path(
+        'v1/export/<str:table>/',
+        ExportViewSet.as_view({'get': 'retrieve'}),
+        name='export'
+    ),
     path('v1/', include(v1_router.urls)),
 ]
@@ -1,94 +1,346 @@
 from django.contrib.auth.tokens import default_token_generator
+from django.http import StreamingHttpResponse
 from django.conf import settings
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
-from rest_framework.viewsets import GenericViewSet
-from rest_framework_simplejwt.tokens import AccessToken
-
-from api.mixins import (GetPostPatchDeleteBaseViewSet,
-                        CategoryGenreBaseViewSet)
+from rest_framework.settings import api_settings
+from rest_framework.viewsets import GenericViewSet, ViewSet
+
+from api.authentication import get_access_token
+from api.cache import (bump_versions, review_version_name,
+                       title_version_name)
+from api.catalog import catalog
+from api.mixins import (CachedResponseMixin, CategoryGenreBaseViewSet,
+                        ConditionalGetMixin, GetPostPatchDeleteBaseViewSet,
+                        NestedResourceMixin)
 from api.filters import TitlesFilter
-from api.permissions import (IsAdmin, IsAdminOrReadOnly,
+from api.permissions import (IsAdminInDatabase, IsAdminOrReadOnly,
                              IsOwnerAdminOrModeratorOrReadOnly)
 from api.serializers import (CategorySerializer, CommentSerializer,
                              GenreSerializer, ReadOnlyTitleSerializer,
                              ReviewSerializer, EditTitleSerializer,
                              TokenSerializer, UserEditSerializer,
                              UserRegisterSerializer, UserSerializer)
+from api.throttling import (AuthBurstRateThrottle, AuthEmailRateThrottle,
+                            AuthSustainedRateThrottle,
+                            AuthUsernameRateThrottle)
+from reviews.export import (CSV, EXPORT_FORMATS, EXPORT_TABLES, NDJSON,
+                            get_filename, iter_export)
 from reviews.models import Category, Genre, Review, Title
+from reviews.search import get_title_search
+from users.mail import send_confirmation_codes
 from users.models import User
 
 
 class CategoryViewSet(CategoryGenreBaseViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_groups = ('categories',)
+    top_titles_field = 'category'
 
 
 class GenreViewSet(CategoryGenreBaseViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_groups = ('genres',)
+    top_titles_field = 'genre'
 
 
-class TitleViewSet(GetPostPatchDeleteBaseViewSet):
-    queryset = Title.objects.all().annotate(
-        rating=Avg('reviews__score')
-    ).order_by('name')
+class TitleViewSet(ConditionalGetMixin, CachedResponseMixin,
+                   GetPostPatchDeleteBaseViewSet):
+    queryset = Title.objects.with_genre_ids().order_by('name')
     serializer_class = EditTitleSerializer
     permission_classes = (IsAdminOrReadOnly,)
     filter_backends = (DjangoFilterBackend,)
     filterset_class = TitlesFilter
+    keyset_ordering = ('name', 'id')
+    cache_groups = ('titles', 'categories', 'genres')
+    rating_filter_params = ('rating_min', 'rating_max')
+    stale_catalog_message = 'Категория или жанр не найдены.'
 
     def get_serializer_class(self):
         if self.action in ('retrieve', 'list'):
             return ReadOnlyTitleSerializer
         return EditTitleSerializer
 
+    def get_etag_dependencies(self):
+        if self.action != 'retrieve':
+            # Рейтинги в списке меняются без смены версий групп.
+            return None
+        return self.cache_groups + (
+            title_version_name(self.kwargs[self.lookup_field]),
+        )
+
+    def get_cache_groups(self):
+        if any(
+            param in self.request.query_params
+            for param in self.rating_filter_params
+        ):
+            # Отзыв меняет рейтинг, а значит и состав отфильтрованного
+            # списка, а не только своё произведение.
+            return self.cache_groups + ('ratings',)
+        return self.cache_groups
+
+    def get_cache_dependencies(self, data):
+        titles = data['results'] if 'results' in data else (data,)
+        return tuple(title_version_name(title['id']) for title in titles)
+
+    def save_titles(self, save):
+        """
+        Сохраняет произведения в транзакции.
+
+        Slug проверяются по справочнику в памяти процесса. Если категорию
+        или жанр уже удалили, внешний ключ нарушается при коммите: тогда
+        справочник сбрасывается, а клиент получает ошибку 400.
+        """
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            catalog.invalidate()
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    self.stale_catalog_message
+                ]
+            })
+
+    def perform_create(self, serializer):
+        self.save_titles(serializer.save)
+
+    def perform_update(self, serializer):
+        self.save_titles(serializer.save)
+
+    def get_bulk_serializers(self, items):
+        """
+        Сериализаторы элементов пакета и ошибки по элементам.
+
+        Все slug пакета проверяются до валидации элементов, так что
+        справочник перечитывается не больше одного раза.
+        """
+        for model, field in ((Genre, 'genre'), (Category, 'category')):
+            slugs = set()
+            for item in items:
+                value = item.get(field)
+                values = value if isinstance(value, list) else [value]
+                slugs.update(slug for slug in values if isinstance(slug, str))
+            catalog.get_by_slugs(model, slugs)
+        ids = [item['id'] for item in items if 'id' in item]
+        if not all(
+            isinstance(pk, int) and not isinstance(pk, bool) for pk in ids
+        ):
+            raise ValidationError({'id': ['Ожидается целое число.']})
+        # Строки блокируются до конца транзакции сохранения пакета.
+        existing = Title.objects.select_for_update().in_bulk(ids)
+        serializers, errors, seen_ids = [], [], set()
+        for item in items:
+            if 'id' not in item:
+                serializer = EditTitleSerializer(data=item)
+            elif item['id'] in seen_ids:
+                serializers.append(None)
+                errors.append({'id': ['Произведение повторяется в пакете.']})
+                continue
+            elif item['id'] in existing:
+                seen_ids.add(item['id'])
+                serializer = EditTitleSerializer(
+                    existing[item['id']], data=item, partial=True
+                )
+            else:
+                serializers.append(None)
+                errors.append({'id': ['Произведение не найдено.']})
+                continue
+            serializers.append(serializer)
+            errors.append({} if serializer.is_valid() else serializer.errors)
+        return serializers, errors
+
+    def save_bulk(self, serializers):
+        """
+        Сохраняет пакет и возвращает результаты по элементам.
+
+        Новые произведения вставляются одним запросом, изменённые
+        обновляются одним запросом, связи с жанрами пишутся пачкой.
+        """
+        results, created, updated, genres = [], [], [], []
+        update_fields = set()
+        for serializer in serializers:
+            data = dict(serializer.validated_data)
+            title_genres = data.pop('genre', None)
+            if serializer.instance is None:
+                title = Title(**data)
+                created.append(title)
+                results.append((title, 'created'))
+            else:
+                title = serializer.instance
+                for attr, value in data.items():
+                    setattr(title, attr, value)
+                update_fields.update(data)
+                updated.append(title)
+                results.append((title, 'updated'))
+            if title_genres is not None:
+                # Повторы slug в элементе дают одну связь, как и в POST.
+                genres.append((title, list(
+                    {genre.pk: genre for genre in title_genres}.values()
+                )))
+        if connection.features.can_return_rows_from_bulk_insert:
+            Title.objects.bulk_create(created)
+        else:
+            # Без RETURNING id новых строк можно получить только так.
+            for title in created:
+                title.save()
+        if update_fields:
+            Title.objects.bulk_update(updated, update_fields)
+        updated_ids = {title.pk for title in updated}
+        links = Title.genre.through
+        links.objects.filter(title_id__in=[
+            title.pk for title, _ in genres if title.pk in updated_ids
+        ]).delete()
+        links.objects.bulk_create([
+            links(title_id=title.pk, genre_id=genre.pk)
+            for title, title_genres in genres
+            for genre in title_genres
+        ])
+        titles = created + updated
+        get_title_search().index(titles)
+        bump_versions(
+            'titles', *(title_version_name(title.pk) for title in titles)
+        )
+        return [
+            {'id': title.pk, 'status': result} for title, result in results
+        ]
+
+    @action(detail=False, methods=('post',))
+    def bulk(self, request):
+        """
+        Создаёт и обновляет произведения пакетом в одной транзакции.
+
+        Элемент с `id` обновляет произведение, без `id` создаёт новое.
+        При ошибке в любом элементе ничего не сохраняется, а ответ
+        содержит ошибки по элементам.
+        """
+        items = request.data
+        if (not isinstance(items, list) or not items
+                or not all(isinstance(item, dict) for item in items)):
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Ожидается непустой список произведений.'
+                ]
+            })
+        if len(items) > settings.TITLES_BULK_MAX_SIZE:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Не больше {} произведений за запрос.'.format(
+                        settings.TITLES_BULK_MAX_SIZE
+                    )
+                ]
+            })
+
+        def save():
+            serializers, errors = self.get_bulk_serializers(items)
+            if any(errors):
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+            return Response(
+                self.save_bulk(serializers), status=status.HTTP_201_CREATED
+            )
 
-class CommentViewSet(GetPostPatchDeleteBaseViewSet):
+        return self.save_titles(save)
+
+
+class CommentViewSet(NestedResourceMixin, ConditionalGetMixin,
+                     GetPostPatchDeleteBaseViewSet):
     serializer_class = CommentSerializer
     permission_classes = (
         IsAuthenticatedOrReadOnly,
         IsOwnerAdminOrModeratorOrReadOnly
     )
+    keyset_ordering = ('-pub_date', '-id')
+    parent_model = Review
+    parent_lookups = {'pk': 'review_id', 'title_id': 'title_id'}
 
-    @property
-    def get_review(self):
-        return get_object_or_404(
-            Review,
-            pk=self.kwargs.get('review_id'),
-            title__id=self.kwargs.get('title_id')
-        )
+    def get_etag_dependencies(self):
+        return ('authors', review_version_name(self.kwargs.get('review_id')))
 
     def get_queryset(self):
-        return self.get_review.comments.select_related('author')
+        return self.get_parent().comments.select_related('author')
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self.get_review)
+        serializer.save(author=self.request.user, review=self.get_parent())
 
 
-class ReviewViewSet(GetPostPatchDeleteBaseViewSet):
+class ReviewViewSet(NestedResourceMixin, ConditionalGetMixin,
+                    GetPostPatchDeleteBaseViewSet):
     serializer_class = ReviewSerializer
     permission_classes = (
         IsAuthenticatedOrReadOnly,
         IsOwnerAdminOrModeratorOrReadOnly,
     )
+    keyset_ordering = ('pub_date', 'id')
+    parent_model = Title
+    parent_lookups = {'pk': 'title_pk'}
 
-    @property
-    def get_title(self):
-        return get_object_or_404(Title, pk=self.kwargs.get('title_pk'))
+    def get_etag_dependencies(self):
+        return ('authors', title_version_name(self.kwargs.get('title_pk')))
 
     def get_queryset(self):
-        return self.get_title.reviews.select_related('author')
+        return self.get_parent().reviews.select_related('author')
 
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title)
+        title = self.get_parent()
+        try:
+            with transaction.atomic():
+                review = serializer.save(
+                    author=self.request.user, title=title
+                )
+        except IntegrityError:
+            # Отзыв уже есть, только если его находит повторный запрос:
+            # остальные нарушения целостности не связаны с повтором.
+            if not Review.objects.filter(
+                title=title, author=self.request.user
+            ).exists():
+                raise
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    serializer.unique_review_message
+                ]
+            })
+        Title.objects.apply_score(review.title_id, review.score, 1)
+
+    def get_locked_score(self, review):
+        """
+        Оценка отзыва из строки, заблокированной до конца транзакции.
+
+        Объект вьюсета загружен без блокировки, и конкурентный запрос
+        мог уже изменить или удалить отзыв.
+        """
+        return get_object_or_404(
+            Review.objects.select_for_update().values_list(
+                'score', flat=True
+            ),
+            pk=review.pk
+        )
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        old_score = self.get_locked_score(serializer.instance)
+        review = serializer.save()
+        if review.score != old_score:
+            Title.objects.apply_score(
+                review.title_id, review.score - old_score
+            )
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        score = self.get_locked_score(instance)
+        _, deleted = instance.delete()
+        if deleted.get(Review._meta.label):
+            Title.objects.apply_score(instance.title_id, -score, -1)
 
 
 class AdminUserViewSet(GetPostPatchDeleteBaseViewSet):
@@ -96,14 +348,21 @@ class AdminUserViewSet(GetPostPatchDeleteBaseViewSet):
     search_fields = ('username', 'email')
     queryset = User.objects.all()
     serializer_class = UserSerializer
-    permission_classes = (IsAdmin,)
+    permission_classes = (IsAdminInDatabase,)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        title_ids = list(instance.reviews.values_list('title_id', flat=True))
+        instance.delete()
+        Title.objects.filter(pk__in=title_ids).rebuild_ratings()
 
     @action(detail=False,
             methods=('get', 'patch',),
             permission_classes=(IsAuthenticated,),
             serializer_class=UserEditSerializer)
     def me(self, request, format=None):
-        user = request.user
+        # В request.user только снимок из кэша аутентификации.
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method == 'PATCH':
             serializer = self.serializer_class(
                 user,
@@ -122,40 +381,61 @@ class RegisterViewSet(GenericViewSet):
     queryset = User.objects.all()
     serializer_class = UserRegisterSerializer
     permission_classes = (AllowAny,)
+    throttle_classes = (
+        AuthBurstRateThrottle, AuthSustainedRateThrottle,
+        AuthUsernameRateThrottle, AuthEmailRateThrottle
+    )
+
+    mismatch_message = 'email и username не совпадают ни с одним user.'
+
+    def find_user(self, email, username):
+        """
+        Ищет пользователя по email и username одним запросом.
+
+        Возвращает (найден ли конфликт, пользователь или None).
+        """
+        users = list(
+            User.objects.filter(Q(email=email) | Q(username=username))[:2]
+        )
+        if not users:
+            return False, None
+        user = users[0]
+        if len(users) > 1 or (user.email, user.username) != (email, username):
+            return True, None
+        return False, user
+
+    def get_or_create_user(self, email, username):
+        """
+        Возвращает пользователя с email и username или создаёт его.
+
+        Одновременная регистрация обрабатывается уникальными
+        ограничениями: при конфликте пользователь ищется повторно.
+        """
+        conflict, user = self.find_user(email, username)
+        if conflict or user is not None:
+            return user
+        try:
+            with transaction.atomic():
+                return User.objects.create(email=email, username=username)
+        except IntegrityError:
+            return self.find_user(email, username)[1]
 
     def create(self, request, *args, **kwargs):
-        username = request.data.get('username')
-        user_email = request.data.get('email')
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        # Получаем пользователя по email и username
-        user_by_email = User.objects.filter(email=user_email).first()
-        user_by_username = User.objects.filter(username=username).first()
-
-        # Проверяем результаты
-        if (user_by_email != user_by_username):
+        user = self.get_or_create_user(
+            serializer.validated_data['email'],
+            serializer.validated_data['username']
+        )
+        if user is None:
             return Response(
-                data={
-                    'detail': 'email и username не совпадают ни с одним user.'
-                },
+                data={'detail': self.mismatch_message},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        user, created = User.objects.get_or_create(
-            email=user_email,
-            username=username)
-
         # Создаем и отправляем код подтверждения
-        confirmation_code = default_token_generator.make_token(
-            user_by_username or user
-        )
-        send_mail(
-            subject='Регистрация в YaMDb',
-            message=f'Ваш одноразовый код: {confirmation_code}',
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=(user_email,)
-        )
+        send_confirmation_codes((user,))
 
         return Response(
             serializer.data,
@@ -167,6 +447,10 @@ class TokenJWTViewSet(GenericViewSet):
     queryset = User.objects.all()
     serializer_class = TokenSerializer
     permission_classes = (AllowAny,)
+    throttle_classes = (
+        AuthBurstRateThrottle, AuthSustainedRateThrottle,
+        AuthUsernameRateThrottle
+    )
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -180,7 +464,34 @@ class TokenJWTViewSet(GenericViewSet):
             user,
             serializer.validated_data['confirmation_code']
         ):
-            token = AccessToken.for_user(user)
+            token = get_access_token(user)
             return Response({'token': str(token)}, status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ExportViewSet(ViewSet):
+    """Потоковая выгрузка таблицы в CSV или NDJSON для администратора."""
+
+    permission_classes = (IsAdminInDatabase,)
+    content_types = {
+        CSV: 'text/csv; charset=utf-8',
+        NDJSON: 'application/x-ndjson; charset=utf-8',
+    }
+
+    def retrieve(self, request, table=None):
+        if table not in EXPORT_TABLES:
+            raise NotFound(f'Таблица {table} не найдена.')
+        export_format = request.query_params.get('export_format', CSV)
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                {'export_format': f'Допустимые форматы: {EXPORT_FORMATS}.'}
+            )
+        response = StreamingHttpResponse(
+            iter_export(table, export_format),
+            content_type=self.content_types[export_format]
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{get_filename(table, export_format)}"'
+        )
+        return response
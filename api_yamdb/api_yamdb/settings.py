@@ -73,6 +73,46 @@ DATABASES = {
 }
 
 
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Кэш ответов публичных эндпоинтов для анонимных пользователей и версии
+# для ETag. При нескольких процессах нужен общий бэкенд (Redis, Memcached).
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 60 * 5
+# Версии групп живут ограниченное время: с кэшем в памяти процесса
+# изменения из других процессов видны не позже чем через это время.
+RESPONSE_CACHE_VERSION_TIMEOUT = RESPONSE_CACHE_TIMEOUT
+
+# Справочник категорий и жанров в памяти процесса: максимальный возраст
+# снимка и минимальный интервал перечитывания при промахе, в секундах.
+CATALOG_MAX_AGE = 60
+CATALOG_MISS_RELOAD_INTERVAL = 5
+
+# Максимальное количество произведений в пакетном запросе.
+TITLES_BULK_MAX_SIZE = 500
+
+# Конфигурация полнотекстового поиска произведений в PostgreSQL.
+TITLE_SEARCH_CONFIG = 'russian'
+
+# Рейтинг лучших произведений жанров и категорий: длина списка и
+# минимальное количество отзывов для попадания в него.
+TOP_TITLES_SIZE = 10
+TOP_TITLES_MIN_REVIEWS = 3
+
+# Счётчики ограничения частоты запросов к регистрации и токену.
+THROTTLE_CACHE_ALIAS = 'default'
+
+# Снимок пользователя для JWT-аутентификации.
+AUTH_USER_CACHE_ALIAS = 'default'
+AUTH_USER_CACHE_TIMEOUT = 60
+
+
 # Password validation
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -96,15 +136,23 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
 
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.PageNumberOrKeysetPagination',
     'PAGE_SIZE': 10,
 
     'DEFAULT_FILTER_BACKENDS': (
         'rest_framework.filters.SearchFilter',
     ),
+
+    # Ограничения для регистрации и получения токена: всплеск и
+    # длительная нагрузка с одного IP, запросы для одного username/email.
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_burst': '10/min',
+        'auth_sustained': '100/hour',
+        'auth_identity': '5/min',
+    },
 }
 
 
@@ -113,12 +161,25 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Роль и флаги прав в access-токене: права проверяются без запроса к
+# базе данных, но смена роли вступит в силу только с новым токеном.
+JWT_ROLE_CLAIMS = False
+
 
 # Подключаем бэкенд filebased.EmailBackend:
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 # Указываем директорию, в которую будут сохраняться файлы писем:
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
+# Очередь исходящих писем: при EMAIL_OUTBOX = True письма отправляются
+# командой send_emails, а не во время запроса.
+EMAIL_OUTBOX = False
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+# Задержка перед повторной попыткой в секундах, удваивается с каждой.
+EMAIL_OUTBOX_RETRY_DELAY = 60
+# Количество писем, отправляемых через соединение одной пачкой.
+EMAIL_BATCH_SIZE = 500
+
 
 # Internationalization
 
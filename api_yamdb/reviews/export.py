@@ -0,0 +1,111 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from users.models import User
+
+CSV = 'csv'
+NDJSON = 'ndjson'
+EXPORT_FORMATS = (CSV, NDJSON)
+DEFAULT_CHUNK_SIZE = 2000
+
+# Таблица: модель, имя файла и пары (колонка CSV, атрибут модели).
+# Колонки совпадают с файлами, которые читает команда import_data.
+EXPORT_TABLES = {
+    'users': (User, 'users', (
+        ('id', 'id'),
+        ('username', 'username'),
+        ('email', 'email'),
+        ('role', 'role'),
+        ('bio', 'bio'),
+        ('first_name', 'first_name'),
+        ('last_name', 'last_name'),
+    )),
+    'category': (Category, 'category', (
+        ('id', 'id'),
+        ('name', 'name'),
+        ('slug', 'slug'),
+    )),
+    'genre': (Genre, 'genre', (
+        ('id', 'id'),
+        ('name', 'name'),
+        ('slug', 'slug'),
+    )),
+    'titles': (Title, 'titles', (
+        ('id', 'id'),
+        ('name', 'name'),
+        ('year', 'year'),
+        ('category', 'category_id'),
+        ('description', 'description'),
+    )),
+    'genre_title': (Title.genre.through, 'genre_title', (
+        ('id', 'id'),
+        ('title_id', 'title_id'),
+        ('genre_id', 'genre_id'),
+    )),
+    'review': (Review, 'review', (
+        ('id', 'id'),
+        ('title_id', 'title_id'),
+        ('text', 'text'),
+        ('author', 'author_id'),
+        ('score', 'score'),
+        ('pub_date', 'pub_date'),
+    )),
+    'comments': (Comment, 'comments', (
+        ('id', 'id'),
+        ('review_id', 'review_id'),
+        ('text', 'text'),
+        ('author', 'author_id'),
+        ('pub_date', 'pub_date'),
+    )),
+}
+
+
+class Echo:
+    """Буфер для csv.writer, возвращающий записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def get_filename(table, export_format):
+    return f'{EXPORT_TABLES[table][1]}.{export_format}'
+
+
+def iter_values(table, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Построчно читает таблицу серверным курсором.
+
+    В памяти одновременно находится не больше `chunk_size` строк.
+    """
+    model, _, columns = EXPORT_TABLES[table]
+    queryset = model.objects.order_by('pk').values_list(
+        *(attname for _, attname in columns)
+    )
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+def iter_csv(table, chunk_size=DEFAULT_CHUNK_SIZE):
+    writer = csv.writer(Echo())
+    yield writer.writerow(column for column, _ in EXPORT_TABLES[table][2])
+    for values in iter_values(table, chunk_size):
+        yield writer.writerow(values)
+
+
+def iter_ndjson(table, chunk_size=DEFAULT_CHUNK_SIZE):
+    columns = [column for column, _ in EXPORT_TABLES[table][2]]
+    for values in iter_values(table, chunk_size):
+        yield json.dumps(
+            dict(zip(columns, values)),
+            cls=DjangoJSONEncoder,
+            ensure_ascii=False
+        ) + '\n'
+
+
+def iter_export(table, export_format, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Возвращает строки выгрузки таблицы в формате CSV или NDJSON."""
+    if export_format == NDJSON:
+        return iter_ndjson(table, chunk_size)
+    return iter_csv(table, chunk_size)
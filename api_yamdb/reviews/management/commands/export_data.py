@@ -0,0 +1,63 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.export import (CSV, DEFAULT_CHUNK_SIZE, EXPORT_FORMATS,
+                            EXPORT_TABLES, get_filename, iter_export)
+
+DEFAULT_OUTPUT_DIR = 'export'
+
+
+class Command(BaseCommand):
+    help = 'Выгружает данные из базы данных в CSV или NDJSON файлы'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            dest='export_format',
+            choices=EXPORT_FORMATS,
+            default=CSV,
+            help='Формат выгрузки.'
+        )
+        parser.add_argument(
+            '--output-dir',
+            default=DEFAULT_OUTPUT_DIR,
+            help='Каталог для файлов выгрузки.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Количество строк, читаемых из базы за один раз.'
+        )
+        parser.add_argument(
+            '--tables',
+            nargs='+',
+            choices=tuple(EXPORT_TABLES),
+            default=tuple(EXPORT_TABLES),
+            help='Выгружаемые таблицы.'
+        )
+
+    def handle(self, *args, **options):
+        os.makedirs(options['output_dir'], exist_ok=True)
+        for table in options['tables']:
+            started = time.monotonic()
+            path = os.path.join(
+                options['output_dir'],
+                get_filename(table, options['export_format'])
+            )
+            # Строка заголовка CSV не считается.
+            rows = -1 if options['export_format'] == CSV else 0
+            with open(path, 'w', encoding='utf-8', newline='') as file:
+                for line in iter_export(
+                    table, options['export_format'], options['chunk_size']
+                ):
+                    file.write(line)
+                    rows += 1
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'{table}: выгружено {rows} строк в {path} '
+                    f'за {time.monotonic() - started:.2f} с.'
+                )
+            )
@@ -1,10 +1,17 @@
-import io
 import csv
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 
 from django.core.management.base import BaseCommand
+from django.db import IntegrityError, connection, transaction
 
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TopTitle)
+from reviews.search import get_title_search
 from users.models import User
 
 
@@ -16,148 +23,365 @@ PATH_TO_CSV_REVIEW = 'static/data/review.csv'
 PATH_TO_CSV_COMMENT = 'static/data/comments.csv'
 PATH_TO_CSV_GENRE_TITLE = 'static/data/genre_title.csv'
 
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_CHECKPOINT = 'import_data.checkpoint.json'
+
+# Таблица, модель, файл и таблицы, которые должны быть загружены раньше.
+IMPORT_PLAN = (
+    ('users', User, PATH_TO_CSV_USERS, ()),
+    ('category', Category, PATH_TO_CSV_CATEGORY, ()),
+    ('genre', Genre, PATH_TO_CSV_GENRE, ()),
+    ('titles', Title, PATH_TO_CSV_TITLE, ('category',)),
+    ('review', Review, PATH_TO_CSV_REVIEW, ('titles', 'users')),
+    ('comments', Comment, PATH_TO_CSV_COMMENT, ('review', 'users')),
+    ('genre_title', Title.genre.through, PATH_TO_CSV_GENRE_TITLE,
+     ('titles', 'genre')),
+)
+
+NOT_FOUND_MESSAGES = {
+    User: 'Пользователь с ID {} не найден.',
+    Category: 'Категория с ID {} не найдена.',
+    Genre: 'Жанр с ID {} не найден.',
+    Title: 'Произведение с ID {} не найдено.',
+    Review: 'Отзыв с ID {} не найден.',
+}
+
 
 class Command(BaseCommand):
     help = 'Импортирует данные из CSV файлов в базу данных'
+    batch_size = DEFAULT_BATCH_SIZE
+    upsert = False
 
-    def process_title(self, row):
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество строк, сохраняемых одним запросом.'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            default=DEFAULT_CHECKPOINT,
+            help='Файл с позицией последней сохранённой пачки.'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Продолжить прерванный импорт с сохранённой позиции.'
+        )
+        parser.add_argument(
+            '--upsert',
+            action='store_true',
+            help='Добавлять только новые строки и обновлять изменённые.'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Количество таблиц, загружаемых одновременно.'
+        )
+
+    def load_checkpoint(self, path, resume):
+        self.checkpoint_path = path
+        self.checkpoint = {}
+        self.checkpoint_lock = threading.Lock()
+        if resume and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                self.checkpoint = json.load(file)
+
+    def save_checkpoint(self, filepath, **state):
+        """Атомарно записывает позицию импорта файла."""
+        with self.checkpoint_lock:
+            self.checkpoint[filepath] = state
+            tmp_path = f'{self.checkpoint_path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump(self.checkpoint, file)
+            os.replace(tmp_path, self.checkpoint_path)
+
+    def read_csv(self, filepath, offset=0):
+        """
+        Построчно читает CSV, возвращая запись и смещение после неё.
+
+        Файл не загружается в память целиком, а смещение в байтах
+        указывает на границу записи, с которой можно продолжить чтение.
+        """
+        with open(filepath, 'rb') as file:
+            header = next(csv.reader([file.readline().decode('utf-8-sig')]))
+            position = max(offset, file.tell())
+            file.seek(position)
+
+            def lines():
+                nonlocal position
+                for line in file:
+                    position += len(line)
+                    yield line.decode('utf-8')
+
+            for values in csv.reader(lines()):
+                yield dict(zip(header, values)), position
+
+    def load_ids(self):
+        """Загружает существующие id для проверки внешних ключей."""
+        self.ids = {
+            model: set(model.objects.values_list('id', flat=True))
+            for model in (User, Category, Genre, Title, Review)
+        }
+
+    def get_related_id(self, row, field, model):
+        value = row.pop(field)
         try:
-            category_id = int(row['category'])
-            category_instance = Category.objects.get(id=category_id)
-            row['category'] = category_instance
-        except Category.DoesNotExist:
+            related_id = int(value)
+        except ValueError:
             self.stdout.write(
-                self.style.ERROR(
-                    f'Категория с ID {category_id} не найдена.'
-                )
+                self.style.ERROR(f'Некорректный ID в поле {field}: {value}.')
             )
             return None
-        except ValueError:
+        if related_id not in self.ids[model]:
             self.stdout.write(
-                self.style.ERROR(
-                    f'Некорректный ID категории {row["category"]}.'
-                )
+                self.style.ERROR(NOT_FOUND_MESSAGES[model].format(related_id))
             )
             return None
+        return related_id
+
+    def process_related(self, row, fields):
+        for field, column, model in fields:
+            row[field] = self.get_related_id(row, column, model)
+            if row[field] is None:
+                return None
         return row
 
+    def process_title(self, row):
+        if not row['category']:
+            del row['category']
+            row['category_id'] = None
+            return row
+        return self.process_related(
+            row, (('category_id', 'category', Category),)
+        )
+
     def process_review(self, row):
         try:
             pub_date = datetime.fromisoformat(
                 row['pub_date'].replace('Z', '+00:00')
             )
-            row['pub_date'] = pub_date.date()
-            author_id = int(row['author'])
-            author_instance = User.objects.get(id=author_id)
-            row['author'] = author_instance
-        except User.DoesNotExist:
-            self.stdout.write(
-                self.style.ERROR(
-                    f'Пользователь с ID {author_id} не найден.'
-                )
-            )
-            return None
         except ValueError:
             self.stdout.write(
-                self.style.ERROR(
-                    f'Некорректный ID пользователя {row["author"]}.'
-                )
+                self.style.ERROR(f'Некорректная дата {row["pub_date"]}.')
             )
             return None
-        return row
+        row['pub_date'] = pub_date.date()
+        return self.process_related(
+            row,
+            (('title_id', 'title_id', Title), ('author_id', 'author', User))
+        )
 
     def process_comment(self, row):
+        return self.process_related(
+            row,
+            (('review_id', 'review_id', Review), ('author_id', 'author', User))
+        )
+
+    def process_genre_title(self, row):
+        return self.process_related(
+            row,
+            (('title_id', 'title_id', Title), ('genre_id', 'genre_id', Genre))
+        )
+
+    def save_batch(self, model, instances):
+        """
+        Сохраняет пачку объектов одной транзакцией и возвращает их id.
+
+        При ошибке целостности пачка сохраняется построчно, чтобы
+        пропустить только некорректные строки. Связи произведений с
+        жанрами вставляются напрямую в промежуточную таблицу, уже
+        существующие пары пропускаются самой базой данных.
+        """
         try:
-            author_id = int(row['author'])
-            author_instance = User.objects.get(id=author_id)
-            row['author'] = author_instance
-        except User.DoesNotExist:
-            self.stdout.write(
-                self.style.ERROR(
-                    f'Пользователь с ID {author_id} не найден.'
+            with transaction.atomic():
+                model.objects.bulk_create(
+                    instances,
+                    ignore_conflicts=model is Title.genre.through
                 )
-            )
-            return None
-        except ValueError:
-            self.stdout.write(
-                self.style.ERROR(
-                    f'Некорректный ID пользователя {row["author"]}.'
+            return [instance.id for instance in instances]
+        except IntegrityError:
+            pass
+        saved = []
+        for instance in instances:
+            try:
+                with transaction.atomic():
+                    instance.save(force_insert=True)
+                saved.append(instance.id)
+            except IntegrityError as e:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f'Ошибка при импорте {model.__name__} '
+                        f'с ID {instance.id}: {str(e)}'
+                    )
                 )
-            )
-            return None
-        return row
+        return saved
+
+    def get_update_fields(self, model, header):
+        """
+        Поля модели, которые сравниваются и обновляются при upsert.
+
+        Поля выбираются по заголовку CSV: столбец может называться как
+        поле (`author`) или как его атрибут в базе данных (`title_id`).
+        """
+        return [
+            field.attname for field in model._meta.concrete_fields
+            if not field.primary_key
+            and not getattr(field, 'auto_now_add', False)
+            and (field.name in header or field.attname in header)
+        ]
+
+    def update_existing(self, model, instances, fields):
+        """
+        Обновляет изменившиеся объекты пачки и возвращает новые.
+
+        Существующие объекты загружаются одним запросом по первичным
+        ключам, неизменённые строки не записываются.
+        """
+        for instance in instances:
+            for name in [model._meta.pk.attname, *fields]:
+                field = model._meta.get_field(name)
+                setattr(
+                    instance, name, field.to_python(getattr(instance, name))
+                )
+        existing = model.objects.in_bulk(
+            [instance.pk for instance in instances]
+        )
+        new, changed = [], []
+        for instance in instances:
+            current = existing.get(instance.pk)
+            if current is None:
+                new.append(instance)
+            elif any(
+                getattr(current, name) != getattr(instance, name)
+                for name in fields
+            ):
+                changed.append(instance)
+        if changed:
+            model.objects.bulk_update(changed, fields)
+        return new, len(changed)
+
+    def flush_batch(self, model, batch, fields):
+        updated = 0
+        with transaction.atomic():
+            if self.upsert:
+                batch, updated = self.update_existing(model, batch, fields)
+            saved = self.save_batch(model, batch)
+        if model in self.ids:
+            self.ids[model].update(map(int, saved))
+        return len(saved), updated
 
     def import_data_from_csv(self, model, filepath):
-        with open(filepath, 'r', encoding='utf-8') as file:
-            data = file.read()
-            reader = csv.DictReader(io.StringIO(data))
-
-            for row in reader:
-                if model == Title:
-                    row = self.process_title(row)
-                elif model == Review:
-                    row = self.process_review(row)
-                elif model == Comment:
-                    row = self.process_comment(row)
-
-                if row is None:
-                    continue
-
-                instance = model(**row)
-                try:
-                    instance.save()
-                    self.stdout.write(
-                        self.style.SUCCESS(
-                            f'{model.__name__} с ID {row["id"]}'
-                            f'импортирован успешно.'
-                        )
-                    )
-                except Exception as e:
-                    self.stdout.write(
-                        self.style.ERROR(
-                            f'Ошибка при импорте {model.__name__} '
-                            f'с ID {row["id"]}: {str(e)}'
-                        )
-                    )
+        processors = {
+            Title: self.process_title,
+            Review: self.process_review,
+            Comment: self.process_comment,
+            Title.genre.through: self.process_genre_title,
+        }
+        process = processors.get(model)
+        state = self.checkpoint.get(filepath, {})
+        if state.get('done'):
+            self.stdout.write(f'{model.__name__}: уже импортирован.')
+            return
+        offset = state.get('offset', 0)
+        rows = state.get('rows', 0)
+        created = state.get('created', 0)
+        updated = state.get('updated', 0)
+        skipped = state.get('skipped', 0)
+        batch = []
+        fields = None
+        for row, offset in self.read_csv(filepath, offset):
+            rows += 1
+            if fields is None:
+                fields = self.get_update_fields(model, row)
+            if process is not None:
+                row = process(row)
+            if row is None:
+                skipped += 1
+                continue
+            batch.append(model(**row))
+            if len(batch) >= self.batch_size:
+                batch_created, batch_updated = self.flush_batch(
+                    model, batch, fields
+                )
+                created += batch_created
+                updated += batch_updated
+                batch = []
+                self.save_checkpoint(
+                    filepath, offset=offset, rows=rows, created=created,
+                    updated=updated, skipped=skipped
+                )
+        if batch:
+            batch_created, batch_updated = self.flush_batch(
+                model, batch, fields
+            )
+            created += batch_created
+            updated += batch_updated
+        self.save_checkpoint(
+            filepath, offset=offset, rows=rows, created=created,
+            updated=updated, skipped=skipped, done=True
+        )
+        summary = f'{model.__name__}: импортировано {created}, '
+        if self.upsert:
+            summary += f'обновлено {updated}, '
+        self.stdout.write(
+            self.style.SUCCESS(f'{summary}пропущено {skipped}.')
+        )
 
-    def import_genre_title_relation(self, filepath):
-        with open(filepath, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                try:
-                    title = Title.objects.get(id=row['title_id'])
-                    genre = Genre.objects.get(id=row['genre_id'])
-                    title.genre.add(genre)
-                    self.stdout.write(
-                        self.style.SUCCESS(
-                            f'Жанр с ID {row["genre_id"]} успешно добавлен '
-                            f'к произведению с ID {row["title_id"]}.'
-                        )
-                    )
-                except Title.DoesNotExist:
-                    self.stdout.write(
-                        self.style.ERROR(
-                            f'Произведение с ID {row["title_id"]} не найдено.'
-                        )
-                    )
-                except Genre.DoesNotExist:
-                    self.stdout.write(
-                        self.style.ERROR(
-                            f'Жанр с ID {row["genre_id"]} не найден.'
-                        )
-                    )
-                except Exception as e:
-                    self.stdout.write(
-                        self.style.ERROR(
-                            f'Ошибка при обработке строки {e}'
-                        )
-                    )
+    def import_table(self, model, filepath):
+        """Загружает таблицу в потоке пула и возвращает время загрузки."""
+        started = time.monotonic()
+        try:
+            self.import_data_from_csv(model, filepath)
+        finally:
+            connection.close()
+        return time.monotonic() - started
+
+    def run_import_plan(self, workers):
+        """
+        Загружает таблицы пулом потоков с учётом зависимостей.
+
+        Таблица ставится в очередь, когда все её родительские таблицы
+        загружены и закоммичены.
+        """
+        tables = {name: (model, path) for name, model, path, _ in IMPORT_PLAN}
+        waiting = {name: set(parents) for name, *_, parents in IMPORT_PLAN}
+        timings = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            running = {}
+            while waiting or running:
+                for name in [
+                    name for name, parents in waiting.items() if not parents
+                ]:
+                    del waiting[name]
+                    future = executor.submit(self.import_table, *tables[name])
+                    running[future] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    timings[name] = future.result()
+                    for parents in waiting.values():
+                        parents.discard(name)
+        return timings
 
     def handle(self, *args, **options):
-        self.import_data_from_csv(User, PATH_TO_CSV_USERS)
-        self.import_data_from_csv(Category, PATH_TO_CSV_CATEGORY)
-        self.import_data_from_csv(Title, PATH_TO_CSV_TITLE)
-        self.import_data_from_csv(Genre, PATH_TO_CSV_GENRE)
-        self.import_data_from_csv(Review, PATH_TO_CSV_REVIEW)
-        self.import_data_from_csv(Comment, PATH_TO_CSV_COMMENT)
-        self.import_genre_title_relation(PATH_TO_CSV_GENRE_TITLE)
+        self.batch_size = options['batch_size']
+        self.upsert = options['upsert']
+        self.load_checkpoint(options['checkpoint'], options['resume'])
+        self.load_ids()
+        workers = max(options['workers'], 1)
+        if workers > 1 and connection.vendor == 'sqlite':
+            self.stdout.write(self.style.WARNING(
+                'SQLite не поддерживает параллельную запись, '
+                'таблицы загружаются по очереди.'
+            ))
+            workers = 1
+        timings = self.run_import_plan(workers)
+        Title.objects.rebuild_ratings()
+        TopTitle.objects.rebuild()
+        get_title_search().rebuild()
+        for name, *_ in IMPORT_PLAN:
+            self.stdout.write(f'{name}: {timings[name]:.2f} с')
+        os.remove(self.checkpoint_path)
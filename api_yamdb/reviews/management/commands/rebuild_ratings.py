@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Title
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённые рейтинги произведений по отзывам'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rated = Title.objects.rebuild_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Рейтинги пересчитаны, произведений с оценками: {rated}.'
+            )
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import TopTitle
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает рейтинги лучших произведений жанров и категорий'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size',
+            type=int,
+            help='Количество произведений в рейтинге.'
+        )
+        parser.add_argument(
+            '--min-reviews',
+            type=int,
+            help='Минимальное количество отзывов у произведения.'
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            positions = TopTitle.objects.rebuild(
+                options['size'], options['min_reviews']
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Рейтинги лучших произведений пересобраны, мест: {positions}.'
+            )
+        )
@@ -0,0 +1,41 @@
+# Generated by Django 3.2 on 2026-10-18 17:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TopTitle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(verbose_name='Место')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='top_titles', to='reviews.category', verbose_name='Категория')),
+                ('genre', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='top_titles', to='reviews.genre', verbose_name='Жанр')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='top_positions', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Место в рейтинге',
+                'verbose_name_plural': 'Места в рейтинге',
+                'ordering': ('position',),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='toptitle',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('category__isnull', True), ('genre__isnull', False)), models.Q(('category__isnull', False), ('genre__isnull', True)), _connector='OR'), name='top_title_single_group'),
+        ),
+        migrations.AddConstraint(
+            model_name='toptitle',
+            constraint=models.UniqueConstraint(fields=('genre', 'position'), name='unique_genre_top_position'),
+        ),
+        migrations.AddConstraint(
+            model_name='toptitle',
+            constraint=models.UniqueConstraint(fields=('category', 'position'), name='unique_category_top_position'),
+        ),
+    ]
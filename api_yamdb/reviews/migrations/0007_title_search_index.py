@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.db import migrations
+
+FTS_TABLE = 'reviews_title_fts'
+POSTGRES_INDEX = 'reviews_title_search_idx'
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Индекс полнотекстового поиска произведений.
+
+    Выражение индекса PostgreSQL совпадает с вектором, который строит
+    reviews.search.PostgresTitleSearch. Для остальных баз данных
+    индекс не создаётся: поиск выполняется по вхождению слов.
+    """
+    vendor = schema_editor.connection.vendor
+    table = apps.get_model('reviews', 'Title')._meta.db_table
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} '
+            'USING fts5(name, description)'
+        )
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+            f'SELECT id, name, description FROM {table}'
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {POSTGRES_INDEX} ON {table} '
+            'USING GIN (('
+            'setweight(to_tsvector(%s::regconfig, '
+            f'COALESCE({table}.name, %s)), %s) || '
+            'setweight(to_tsvector(%s::regconfig, '
+            f'COALESCE({table}.description, %s)), %s)'
+            '))',
+            (
+                settings.TITLE_SEARCH_CONFIG, '', 'A',
+                settings.TITLE_SEARCH_CONFIG, '', 'B',
+            )
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+    elif vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {POSTGRES_INDEX}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_top_titles'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,4 +1,8 @@
 from django.db import models
+from django.db.models import (Case, Count, ExpressionWrapper, F,
+                              IntegerField, OuterRef, Subquery, Sum, Value,
+                              When)
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
@@ -49,6 +53,58 @@ class Genre(models.Model):
         ordering = ('name',)
 
 
+class TitleQuerySet(models.QuerySet):
+
+    def apply_score(self, title_id, score_delta, count_delta=0):
+        """
+        Инкрементально пересчитывает рейтинг произведения.
+
+        Обновление выполняется одним UPDATE на уровне БД, поэтому
+        конкурентные изменения отзывов не теряются.
+        """
+        new_sum = F('rating_sum') + score_delta
+        new_count = F('rating_count') + count_delta
+        return self.filter(pk=title_id).update(
+            rating_sum=new_sum,
+            rating_count=new_count,
+            rating=Case(
+                When(rating_count__lte=-count_delta, then=Value(None)),
+                default=ExpressionWrapper(
+                    new_sum / new_count, output_field=IntegerField()
+                ),
+            )
+        )
+
+    def with_genre_ids(self):
+        """Подгружает только id жанров, остальное берётся из справочника."""
+        return self.prefetch_related(
+            models.Prefetch('genre', queryset=Genre.objects.only('pk'))
+        )
+
+    def rebuild_ratings(self):
+        """Пересчитывает рейтинг по всем отзывам произведений."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        rating_sum = Subquery(
+            reviews.annotate(total=Sum('score')).values('total')
+        )
+        rating_count = Subquery(
+            reviews.annotate(total=Count('pk')).values('total')
+        )
+        self.update(
+            rating_sum=Coalesce(rating_sum, 0),
+            rating_count=Coalesce(rating_count, 0),
+        )
+        self.filter(rating_count=0).update(rating=None)
+        return self.filter(rating_count__gt=0).update(
+            rating=ExpressionWrapper(
+                F('rating_sum') / F('rating_count'),
+                output_field=IntegerField()
+            )
+        )
+
+
 class Title(models.Model):
     name = models.CharField(
         max_length=settings.MAX_STRING_LENGTH,
@@ -73,6 +129,23 @@ class Title(models.Model):
         related_name='titles',
         null=True
     )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False
+    )
+    rating = models.PositiveSmallIntegerField(
+        verbose_name='Рейтинг',
+        null=True,
+        editable=False
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -81,6 +154,117 @@ class Title(models.Model):
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('name',)
+        indexes = (
+            models.Index(fields=('name', 'id'), name='title_name_id_idx'),
+            models.Index(
+                fields=('category', 'year'), name='title_category_year_idx'
+            ),
+            models.Index(
+                fields=('year', 'rating'), name='title_year_rating_idx'
+            ),
+            models.Index(fields=('rating',), name='title_rating_idx'),
+        )
+
+
+class TopTitleQuerySet(models.QuerySet):
+
+    def get_ranked_titles(self, size, min_reviews, **group):
+        return Title.objects.filter(
+            rating__isnull=False,
+            rating_count__gte=min_reviews,
+            **group
+        ).order_by('-rating', '-rating_count', 'name', 'id').values_list(
+            'pk', flat=True
+        )[:size]
+
+    def rebuild(self, size=None, min_reviews=None):
+        """
+        Пересобирает рейтинги лучших произведений жанров и категорий.
+
+        Учитываются произведения с сохранённым рейтингом и не менее
+        чем `min_reviews` отзывами. Возвращает количество позиций.
+        """
+        size = size or settings.TOP_TITLES_SIZE
+        if min_reviews is None:
+            min_reviews = settings.TOP_TITLES_MIN_REVIEWS
+        groups = [
+            ('genre', genre_id)
+            for genre_id in Genre.objects.values_list('pk', flat=True)
+        ] + [
+            ('category', category_id)
+            for category_id in Category.objects.values_list('pk', flat=True)
+        ]
+        positions = [
+            self.model(
+                title_id=title_id, position=position,
+                **{f'{field}_id': group_id}
+            )
+            for field, group_id in groups
+            for position, title_id in enumerate(
+                self.get_ranked_titles(
+                    size, min_reviews, **{field: group_id}
+                ),
+                start=1
+            )
+        ]
+        self.all().delete()
+        self.bulk_create(positions)
+        return len(positions)
+
+
+class TopTitle(models.Model):
+    """
+    Позиция произведения в рейтинге лучших жанра или категории.
+
+    Таблица пересобирается командой rebuild_top_titles, у каждой
+    позиции задан ровно один из жанра и категории.
+    """
+
+    genre = models.ForeignKey(
+        Genre,
+        on_delete=models.CASCADE,
+        related_name='top_titles',
+        null=True,
+        verbose_name='Жанр'
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name='top_titles',
+        null=True,
+        verbose_name='Категория'
+    )
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='top_positions',
+        verbose_name='Произведение'
+    )
+    position = models.PositiveSmallIntegerField(verbose_name='Место')
+
+    objects = TopTitleQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Место в рейтинге'
+        verbose_name_plural = 'Места в рейтинге'
+        ordering = ('position',)
+        constraints = (
+            models.CheckConstraint(
+                check=(
+                    models.Q(genre__isnull=False, category__isnull=True)
+                    | models.Q(genre__isnull=True, category__isnull=False)
+                ),
+                name='top_title_single_group'
+            ),
+            models.UniqueConstraint(
+                fields=('genre', 'position'),
+                name='unique_genre_top_position'
+            ),
+            models.UniqueConstraint(
+                fields=('category', 'position'),
+                name='unique_category_top_position'
+            ),
+        )
 
 
 class Review(models.Model):
@@ -118,6 +302,12 @@ class Review(models.Model):
                 name='unique review',
             )
         ]
+        indexes = (
+            models.Index(
+                fields=('title', 'pub_date', 'id'),
+                name='review_title_pub_date_idx'
+            ),
+        )
         ordering = ('pub_date',)
 
     def __str__(self):
@@ -146,6 +336,12 @@ class Comment(models.Model):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
+        indexes = (
+            models.Index(
+                fields=('review', 'pub_date', 'id'),
+                name='comment_review_pub_date_idx'
+            ),
+        )
         ordering = ('-pub_date',)
 
     def __str__(self):
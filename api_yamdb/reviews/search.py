@@ -0,0 +1,148 @@
+import re
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import F, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from reviews.models import Title
+
+FTS_TABLE = 'reviews_title_fts'
+
+
+def get_terms(query):
+    """Слова поискового запроса без операторов синтаксиса поиска."""
+    return re.findall(r'\w+', query.lower())
+
+
+class FallbackTitleSearch:
+    """
+    Поиск по вхождению слов в название или описание.
+
+    Используется для баз данных без поддерживаемого полнотекстового
+    поиска: индекса нет, и синхронизировать нечего.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def remove(self, title_ids):
+        pass
+
+    def index(self, titles):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def search(self, queryset, query):
+        terms = get_terms(query)
+        if not terms:
+            return queryset.none()
+        for term in terms:
+            queryset = queryset.filter(
+                Q(name__icontains=term) | Q(description__icontains=term)
+            )
+        return queryset.order_by('name', 'id')
+
+
+class SQLiteTitleSearch(FallbackTitleSearch):
+    """
+    Полнотекстовый поиск по индексу FTS5.
+
+    Индекс создаётся миграцией и хранится в виртуальной таблице, строка
+    которой имеет rowid произведения. Ранжирование выполняется функцией
+    bm25: название весит больше описания.
+    """
+
+    def remove(self, title_ids):
+        if not title_ids:
+            return
+        placeholders = ', '.join(['%s'] * len(title_ids))
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})',
+                list(title_ids)
+            )
+
+    def index(self, titles):
+        titles = list(titles)
+        self.remove([title.pk for title in titles])
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+                'VALUES (%s, %s, %s)',
+                [(title.pk, title.name, title.description) for title in titles]
+            )
+
+    def rebuild(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, name, description) '
+                f'SELECT id, name, description FROM {Title._meta.db_table}'
+            )
+
+    def search(self, queryset, query):
+        terms = get_terms(query)
+        if not terms:
+            return queryset.none()
+        match = ' '.join(f'"{term}"*' for term in terms)
+        table = Title._meta.db_table
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (match,)
+        )).annotate(search_rank=RawSQL(
+            f'SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id',
+            (match,),
+            output_field=FloatField()
+        )).order_by('-search_rank', 'id')
+
+
+class PostgresTitleSearch(FallbackTitleSearch):
+    """
+    Полнотекстовый поиск по tsvector PostgreSQL.
+
+    Вектор вычисляется выражением, совпадающим с GIN-индексом из
+    миграции, поэтому отдельная синхронизация не нужна.
+    """
+
+    def get_vector(self):
+        from django.contrib.postgres.search import SearchVector
+        config = settings.TITLE_SEARCH_CONFIG
+        return (
+            SearchVector('name', weight='A', config=config)
+            + SearchVector('description', weight='B', config=config)
+        )
+
+    def search(self, queryset, query):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+        terms = get_terms(query)
+        if not terms:
+            return queryset.none()
+        search_query = SearchQuery(
+            ' & '.join(f'{term}:*' for term in terms),
+            search_type='raw',
+            config=settings.TITLE_SEARCH_CONFIG
+        )
+        vector = self.get_vector()
+        return queryset.annotate(
+            search_vector=vector,
+            search_rank=SearchRank(vector, search_query)
+        ).filter(search_vector=search_query).order_by(
+            F('search_rank').desc(), 'id'
+        )
+
+
+TITLE_SEARCH_BACKENDS = {
+    'sqlite': SQLiteTitleSearch,
+    'postgresql': PostgresTitleSearch,
+}
+
+
+def get_title_search(using=DEFAULT_DB_ALIAS):
+    """Поиск произведений для базы данных `using`."""
+    connection = connections[using]
+    backend = TITLE_SEARCH_BACKENDS.get(connection.vendor, FallbackTitleSearch)
+    return backend(connection)
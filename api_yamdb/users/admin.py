@@ -1,9 +1,31 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from .models import User
+from .mail import send_confirmation_codes
+from .models import OutgoingEmail, User
 
 UserAdmin.fieldsets += (
     ('Extra Fields', {'fields': ('bio', 'role',)}),
 )
-admin.site.register(User, UserAdmin)
+
+
+@admin.action(description='Повторно отправить коды подтверждения')
+def resend_confirmation_codes(modeladmin, request, queryset):
+    sent = send_confirmation_codes(
+        queryset.only('password', 'last_login', 'email').iterator()
+    )
+    modeladmin.message_user(request, f'Отправлено кодов: {sent}.')
+
+
+@admin.register(User)
+class YamdbUserAdmin(UserAdmin):
+    actions = (resend_confirmation_codes,)
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient', 'subject', 'created_at', 'attempts', 'sent_at'
+    )
+    list_filter = ('sent_at',)
+    search_fields = ('recipient',)
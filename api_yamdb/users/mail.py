@@ -0,0 +1,150 @@
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import OutgoingEmail
+
+CONFIRMATION_SUBJECT = 'Регистрация в YaMDb'
+
+
+def build_confirmation_email(user):
+    """Возвращает тему, текст и получателя письма с кодом подтверждения."""
+    confirmation_code = default_token_generator.make_token(user)
+    return (
+        CONFIRMATION_SUBJECT,
+        f'Ваш одноразовый код: {confirmation_code}',
+        user.email
+    )
+
+
+def iter_batches(iterable, batch_size):
+    iterator = iter(iterable)
+    batch = list(islice(iterator, batch_size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, batch_size))
+
+
+def dispatch_emails(emails, batch_size=None):
+    """
+    Отправляет письма (тема, текст, получатель) пачками.
+
+    Все пачки отправляются через одно соединение с почтовым сервером,
+    а при включённой настройке EMAIL_OUTBOX ставятся в очередь одним
+    запросом на пачку. Возвращает количество обработанных писем.
+    """
+    batch_size = batch_size or settings.EMAIL_BATCH_SIZE
+    count = 0
+    if settings.EMAIL_OUTBOX:
+        for batch in iter_batches(emails, batch_size):
+            OutgoingEmail.objects.bulk_create(
+                OutgoingEmail(
+                    subject=subject,
+                    message=message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    recipient=recipient
+                )
+                for subject, message, recipient in batch
+            )
+            count += len(batch)
+        return count
+    with get_connection() as connection:
+        for batch in iter_batches(emails, batch_size):
+            connection.send_messages([
+                EmailMessage(
+                    subject=subject,
+                    body=message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    to=(recipient,)
+                )
+                for subject, message, recipient in batch
+            ])
+            count += len(batch)
+    return count
+
+
+def send_confirmation_codes(users, batch_size=None):
+    """Отправляет коды подтверждения пользователям пачками."""
+    return dispatch_emails(
+        (build_confirmation_email(user) for user in users), batch_size
+    )
+
+
+def get_queue_depth():
+    """Количество писем, ожидающих отправки."""
+    return OutgoingEmail.objects.filter(
+        sent_at__isnull=True,
+        attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    ).count()
+
+
+def get_retry_delay(attempts):
+    """Экспоненциальная задержка перед следующей попыткой."""
+    return timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def send_outbox_batch(connection, batch_size):
+    """
+    Отправляет пачку писем из очереди через открытое соединение.
+
+    Строки пачки блокируются до конца транзакции, поэтому несколько
+    обработчиков очереди не отправят одно письмо дважды. Возвращает
+    количество отправленных и неотправленных писем.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True).filter(
+                sent_at__isnull=True,
+                next_attempt_at__lte=now,
+                attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+            ).order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        sent, failed = [], []
+        for email in emails:
+            try:
+                EmailMessage(
+                    subject=email.subject,
+                    body=email.message,
+                    from_email=email.from_email,
+                    to=(email.recipient,),
+                    connection=connection
+                ).send()
+            except OSError as error:
+                email.attempts += 1
+                email.last_error = str(error)
+                email.next_attempt_at = now + get_retry_delay(email.attempts)
+                failed.append(email)
+            else:
+                email.attempts += 1
+                email.sent_at = timezone.now()
+                sent.append(email)
+        OutgoingEmail.objects.bulk_update(sent, ('attempts', 'sent_at'))
+        OutgoingEmail.objects.bulk_update(
+            failed, ('attempts', 'last_error', 'next_attempt_at')
+        )
+    return len(sent), len(failed)
+
+
+def send_outbox(batch_size):
+    """
+    Отправляет все готовые письма очереди пачками.
+
+    Все пачки отправляются через одно соединение с почтовым сервером.
+    """
+    total_sent = total_failed = 0
+    with get_connection() as connection:
+        while True:
+            sent, failed = send_outbox_batch(connection, batch_size)
+            total_sent += sent
+            total_failed += failed
+            if sent + failed < batch_size:
+                break
+    return total_sent, total_failed
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.mail import get_queue_depth, send_outbox
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_INTERVAL = 5
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящих писем'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Количество писем, отправляемых одной транзакцией.'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Не завершаться, а проверять очередь с интервалом.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=DEFAULT_INTERVAL,
+            help='Пауза между проверками очереди в секундах.'
+        )
+
+    def drain(self, batch_size):
+        sent, failed = send_outbox(batch_size)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Отправлено писем: {sent}, ошибок: {failed}, '
+                f'в очереди: {get_queue_depth()}.'
+            )
+        )
+
+    def handle(self, *args, **options):
+        self.drain(options['batch_size'])
+        while options['loop']:
+            time.sleep(options['interval'])
+            self.drain(options['batch_size'])
@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 from users.validators import validate_username
 
@@ -94,3 +95,52 @@ class User(AbstractUser):
         ordering = ('username',)
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
+
+
+class OutgoingEmail(models.Model):
+    """
+    Письмо в очереди на отправку.
+
+    Письмо считается отправленным, когда заполнено sent_at. Неудачная
+    отправка увеличивает attempts и откладывает следующую попытку.
+    """
+
+    subject = models.CharField(verbose_name='Тема', max_length=255)
+    message = models.TextField(verbose_name='Текст')
+    from_email = models.EmailField(
+        verbose_name='Отправитель',
+        max_length=settings.MAX_EMAIL_LENGTH
+    )
+    recipient = models.EmailField(
+        verbose_name='Получатель',
+        max_length=settings.MAX_EMAIL_LENGTH
+    )
+    created_at = models.DateTimeField(
+        verbose_name='Дата создания',
+        auto_now_add=True
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Следующая попытка',
+        default=timezone.now
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попытки',
+        default=0
+    )
+    last_error = models.TextField(verbose_name='Последняя ошибка', blank=True)
+    sent_at = models.DateTimeField(
+        verbose_name='Дата отправки',
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        ordering = ('next_attempt_at', 'id')
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = (
+            models.Index(
+                fields=('sent_at', 'next_attempt_at', 'id'),
+                name='outgoing_email_queue_idx'
+            ),
+        )
@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+
+def create_many_titles(amount):
+    category, _ = Category.objects.get_or_create(name='Фильм', slug='films')
+    genres = (
+        Genre.objects.get_or_create(name='Драма', slug='drama')[0],
+        Genre.objects.get_or_create(name='Комедия', slug='comedy')[0],
+    )
+    titles = []
+    for idx in range(amount):
+        title = Title.objects.create(
+            name=f'Произведение {idx}', year=2000, category=category
+        )
+        title.genre.set(genres)
+        titles.append(title)
+    return titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return len(context.captured_queries), response.json()
+
+    def test_01_title_list_constant_queries(self, client):
+        url = f'{self.TITLES_URL}?page_size=100'
+        create_many_titles(2)
+        # Первый запрос загружает справочник категорий и жанров.
+        self.count_queries(client, self.TITLES_URL)
+        small_page_queries, _ = self.count_queries(client, url)
+
+        create_many_titles(98)
+        queries, data = self.count_queries(client, url)
+
+        assert len(data['results']) == 100, (
+            f'Проверьте, что для эндпоинта `{self.TITLES_URL}` размер '
+            'страницы можно задать параметром `page_size`.'
+        )
+        assert queries == small_page_queries, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` выполняет '
+            'постоянное количество запросов к базе данных, не зависящее '
+            'от количества произведений на странице.'
+        )
+
+    def test_02_title_detail_queries(self, client):
+        title = create_many_titles(3)[-1]
+        self.count_queries(client, self.TITLES_URL)
+        queries, data = self.count_queries(
+            client, self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title.pk)
+        )
+        assert len(data['genre']) == 2
+        assert data['category']['slug'] == 'films'
+        assert queries <= 2, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_DETAIL_URL_TEMPLATE}` '
+            'получает жанры и категорию без дополнительных запросов.'
+        )
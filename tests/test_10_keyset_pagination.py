@@ -0,0 +1,124 @@
+import base64
+import json
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Comment, Review, Title
+from tests.utils import check_pagination
+
+
+def walk_pages(client, url, link='next'):
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в курсорном режиме пагинации не выполняется '
+            'подсчёт общего количества объектов.'
+        )
+        pages.append(data['results'])
+        url = data[link]
+    return pages
+
+
+def make_cursor(reverse, values):
+    data = json.dumps((reverse, values)).encode()
+    return base64.urlsafe_b64encode(data).decode()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10KeysetPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_page_number_is_default(self, client):
+        Title.objects.create(name='Произведение', year=2000)
+        response = client.get(self.TITLES_URL)
+        check_pagination(self.TITLES_URL, response.json(), 1)
+
+    def test_02_titles_cursor_walk(self, client):
+        category = Category.objects.create(name='Фильм', slug='films')
+        for idx in range(25):
+            Title.objects.create(
+                name=f'Произведение {idx % 5}', year=2000, category=category
+            )
+        expected = list(
+            Title.objects.order_by('name', 'id').values_list('id', flat=True)
+        )
+
+        pages = walk_pages(client, f'{self.TITLES_URL}?pagination=cursor')
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert [item['id'] for page in pages for item in page] == expected, (
+            f'Проверьте, что курсорная пагинация `{self.TITLES_URL}` '
+            'возвращает все произведения без пропусков и повторов.'
+        )
+
+        last_page_url = client.get(
+            f'{self.TITLES_URL}?pagination=cursor&page_size=20'
+        ).json()['next']
+        pages = walk_pages(client, last_page_url, link='previous')
+        assert [len(page) for page in pages] == [5, 20]
+        assert [
+            item['id'] for page in reversed(pages) for item in page
+        ] == expected, (
+            f'Проверьте, что ссылка `previous` курсорной пагинации '
+            f'`{self.TITLES_URL}` ведёт на предыдущую страницу.'
+        )
+
+    def test_03_reviews_and_comments_cursor_walk(self, client, user):
+        title = Title.objects.create(name='Произведение', year=2000)
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=5
+        )
+        for idx in range(12):
+            Comment.objects.create(
+                review=review, author=user, text=f'Комментарий {idx}'
+            )
+
+        pages = walk_pages(
+            client,
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+            + '?pagination=cursor'
+        )
+        assert [item['id'] for page in pages for item in page] == [review.id]
+
+        pages = walk_pages(
+            client,
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title.id, review_id=review.id
+            ) + '?pagination=cursor&page_size=5'
+        )
+        expected = list(
+            review.comments.order_by('-pub_date', '-id').values_list(
+                'id', flat=True
+            )
+        )
+        assert [item['id'] for page in pages for item in page] == expected
+
+    def test_04_invalid_cursor(self, client):
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_05_edited_cursor(self, client, user):
+        title = Title.objects.create(name='Произведение', year=2000)
+        Review.objects.create(title=title, author=user, text='Отзыв', score=5)
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        for url, values in (
+            (self.TITLES_URL, ['a', 'zzz']),
+            (self.TITLES_URL, ['a', None]),
+            (reviews_url, ['garbage', 1]),
+            (reviews_url, [[1], {'id': 1}]),
+        ):
+            response = client.get(
+                url, {'cursor': make_cursor(False, values)}
+            )
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что курсор со значениями {values} на `{url}` '
+                'возвращает ошибку 404, а не 500.'
+            )
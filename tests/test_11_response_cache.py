@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    TITLES_URL = '/api/v1/titles/'
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def get(self, client, url):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        return response.json(), len(context.captured_queries)
+
+    def test_01_anonymous_list_is_cached(self, client, admin_client):
+        create_titles(admin_client)
+        data, queries = self.get(client, self.TITLES_URL)
+        assert queries > 0
+
+        cached_data, queries = self.get(client, self.TITLES_URL)
+        assert queries == 0, (
+            f'Проверьте, что повторный GET-запрос анонима к '
+            f'`{self.TITLES_URL}` обслуживается из кэша.'
+        )
+        assert cached_data == data
+
+        _, queries = self.get(client, f'{self.TITLES_URL}?page=1')
+        assert queries > 0, (
+            'Проверьте, что параметры запроса входят в ключ кэша.'
+        )
+
+    def test_02_review_evicts_only_its_title(self, client, admin_client,
+                                             user_client):
+        titles, _, _ = create_titles(admin_client)
+        first_url, second_url = (
+            self.TITLES_DETAIL_URL_TEMPLATE.format(title_id=title['id'])
+            for title in titles
+        )
+        self.get(client, first_url)
+        self.get(client, second_url)
+        data, _ = self.get(client, self.TITLES_URL)
+        assert data['results'][0]['rating'] is None
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 7)
+
+        data, queries = self.get(client, first_url)
+        assert queries > 0 and data['rating'] == 7, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведения.'
+        )
+        _, queries = self.get(client, second_url)
+        assert queries == 0, (
+            'Проверьте, что новый отзыв не сбрасывает кэш других '
+            'произведений.'
+        )
+        data, _ = self.get(client, self.TITLES_URL)
+        ratings = {title['id']: title['rating'] for title in data['results']}
+        assert ratings[titles[0]['id']] == 7, (
+            'Проверьте, что новый отзыв сбрасывает кэш страниц списка '
+            'произведений, на которых оно находится.'
+        )
+
+    def test_03_category_change_evicts_list(self, client, admin_client):
+        data, _ = self.get(client, self.CATEGORIES_URL)
+        assert data['count'] == 0
+        admin_client.post(
+            self.CATEGORIES_URL, data={'name': 'Фильм', 'slug': 'films'}
+        )
+        data, _ = self.get(client, self.CATEGORIES_URL)
+        assert data['count'] == 1
+
+        admin_client.delete(f'{self.CATEGORIES_URL}films/')
+        data, _ = self.get(client, self.TITLES_URL)
+        data, _ = self.get(client, self.CATEGORIES_URL)
+        assert data['count'] == 0
@@ -0,0 +1,108 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Title
+from tests.utils import (create_reviews, create_single_comment,
+                         create_single_review, create_titles)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    TITLES_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def check_not_modified(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response.get('ETag')
+        assert etag, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит ETag.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304.'
+        )
+        assert not response.content
+        assert len(context.captured_queries) == 0
+        return etag
+
+    def test_01_title_and_reviews_etag(self, client, admin_client, admin,
+                                       user_client, user):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        title_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        title_etag = self.check_not_modified(client, title_url)
+        reviews_etag = self.check_not_modified(client, reviews_url)
+        comments_etag = self.check_not_modified(client, comments_url)
+
+        create_single_comment(
+            user_client, titles[0]['id'], reviews[0]['id'], 'Комментарий'
+        )
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=comments_etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет ETag списка '
+            'комментариев.'
+        )
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 1)
+        for url, etag in ((title_url, title_etag),
+                          (reviews_url, reviews_etag)):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что новый отзыв меняет ETag ответа `{url}`.'
+            )
+            assert response['ETag'] != etag
+
+    def test_02_versions_expire(self, client, admin_client, settings):
+        settings.RESPONSE_CACHE_VERSION_TIMEOUT = 1
+        titles, _, _ = create_titles(admin_client)
+        title_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        etag = self.check_not_modified(client, title_url)
+        # Изменение в другом процессе не меняет версии в кэше этого.
+        Title.objects.filter(pk=titles[0]['id']).update(name='Другое')
+        time.sleep(1.1)
+        response = client.get(title_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что версии групп кэша хранятся не дольше '
+            'RESPONSE_CACHE_VERSION_TIMEOUT.'
+        )
+        assert response.json()['name'] == 'Другое'
+
+    def test_03_if_match(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_url = self.TITLES_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        for url in (title_url, reviews_url):
+            etag = client.get(url)['ETag']
+            response = client.get(url, HTTP_IF_MATCH='"other"')
+            assert response.status_code == HTTPStatus.PRECONDITION_FAILED, (
+                f'Проверьте, что GET-запрос к `{url}` с несовпадающим '
+                '`If-Match` возвращает ответ со статусом 412.'
+            )
+            response = client.get(url, HTTP_IF_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK
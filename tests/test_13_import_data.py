@@ -0,0 +1,153 @@
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.management.commands import import_data
+from reviews.models import Comment, Genre, Review, Title
+from tests.conftest import MANAGE_PATH
+from users.models import User
+
+
+@pytest.fixture
+def project_dir(monkeypatch):
+    monkeypatch.chdir(MANAGE_PATH)
+
+
+def run_import(*args):
+    out = StringIO()
+    call_command('import_data', *args, stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ImportData:
+
+    def test_01_import_counts(self, project_dir):
+        output = run_import('--batch-size', '10')
+        assert 'Review: импортировано 72, пропущено 0.' in output, (
+            'Проверьте, что команда `import_data` выводит итоговую строку '
+            'по каждой таблице.'
+        )
+        assert User.objects.count() == 5
+        assert Genre.objects.count() == 15
+        assert Title.objects.count() == 32
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        assert Title.genre.through.objects.count() == 42
+        assert Title.objects.filter(rating=None).count() == 0, (
+            'Проверьте, что после импорта рейтинги произведений '
+            'пересчитаны.'
+        )
+
+    def test_02_resume_from_checkpoint(self, project_dir, tmp_path,
+                                       monkeypatch):
+        checkpoint = str(tmp_path / 'checkpoint.json')
+        flush_batch = import_data.Command.flush_batch
+        review_batches = []
+
+        def interrupted_flush_batch(command, model, batch, fields):
+            if model is Review:
+                review_batches.append(len(batch))
+                if len(review_batches) == 3:
+                    raise KeyboardInterrupt
+            return flush_batch(command, model, batch, fields)
+
+        monkeypatch.setattr(
+            import_data.Command, 'flush_batch', interrupted_flush_batch
+        )
+        with pytest.raises(KeyboardInterrupt):
+            run_import('--batch-size', '10', '--checkpoint', checkpoint)
+        assert Review.objects.count() == 20
+        monkeypatch.setattr(import_data.Command, 'flush_batch', flush_batch)
+
+        output = run_import(
+            '--batch-size', '10', '--checkpoint', checkpoint, '--resume'
+        )
+        assert 'Title: уже импортирован.' in output, (
+            'Проверьте, что при `--resume` полностью загруженные файлы '
+            'не читаются повторно.'
+        )
+        assert 'Review: импортировано 72, пропущено 0.' in output, (
+            'Проверьте, что при `--resume` импорт продолжается с последней '
+            'сохранённой пачки.'
+        )
+        assert Review.objects.count() == 72
+        assert not os.path.exists(checkpoint)
+
+    def test_03_parallel_import(self, project_dir):
+        output = run_import('--workers', '3')
+        if connection.vendor == 'sqlite':
+            assert 'SQLite не поддерживает параллельную запись' in output
+        for table in ('users', 'category', 'genre', 'titles', 'review',
+                      'comments', 'genre_title'):
+            assert f'{table}: ' in output, (
+                'Проверьте, что команда `import_data` выводит время '
+                'загрузки каждой таблицы.'
+            )
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        assert Title.genre.through.objects.count() == 42
+
+    def test_04_genre_title_batches(self, project_dir):
+        run_import()
+        Title.genre.through.objects.filter(pk__gt=20).delete()
+        command = import_data.Command(stdout=StringIO())
+        command.load_checkpoint(import_data.DEFAULT_CHECKPOINT, False)
+        command.load_ids()
+
+        with CaptureQueriesContext(connection) as context:
+            command.import_data_from_csv(
+                Title.genre.through, import_data.PATH_TO_CSV_GENRE_TITLE
+            )
+        os.remove(import_data.DEFAULT_CHECKPOINT)
+        assert Title.genre.through.objects.count() == 42, (
+            'Проверьте, что импорт связей произведений и жанров пропускает '
+            'уже существующие пары.'
+        )
+        assert len(context.captured_queries) <= 5, (
+            'Проверьте, что связи произведений и жанров сохраняются '
+            'пачками, а не отдельными запросами на каждую строку.'
+        )
+
+    def test_05_upsert_touches_only_delta(self, project_dir):
+        run_import()
+        Genre.objects.filter(pk=1).update(name='Изменённый жанр')
+        Review.objects.filter(pk=1).delete()
+
+        output = run_import('--upsert')
+        assert 'Genre: импортировано 0, обновлено 1, пропущено 0.' in output
+        assert 'Review: импортировано 1, обновлено 0, пропущено 0.' in output
+        assert 'Title: импортировано 0, обновлено 0, пропущено 0.' in output
+        assert 'Ошибка' not in output, (
+            'Проверьте, что повторный импорт с `--upsert` не пытается '
+            'вставить уже существующие строки.'
+        )
+        assert Genre.objects.get(pk=1).name == 'Драма'
+        assert Review.objects.count() == 72
+
+    def test_06_upsert_null_category_first(self, project_dir, tmp_path):
+        run_import()
+        first, second = Title.objects.order_by('id')[:2]
+        category_id = 2 if second.category_id != 2 else 1
+        path = tmp_path / 'titles.csv'
+        path.write_text(
+            'id,name,year,category\n'
+            f'{first.id},{first.name},{first.year},\n'
+            f'{second.id},{second.name},{second.year},{category_id}\n',
+            encoding='utf-8'
+        )
+        command = import_data.Command(stdout=StringIO())
+        command.upsert = True
+        command.load_checkpoint(str(tmp_path / 'checkpoint.json'), False)
+        command.load_ids()
+        command.import_data_from_csv(Title, str(path))
+
+        assert Title.objects.get(pk=first.id).category_id is None
+        assert Title.objects.get(pk=second.id).category_id == category_id, (
+            'Проверьте, что при `--upsert` категория произведения '
+            'обновляется, даже если у первой строки файла её нет.'
+        )
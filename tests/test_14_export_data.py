@@ -0,0 +1,86 @@
+import json
+import os
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.export import EXPORT_TABLES
+from reviews.models import Genre
+from tests.conftest import MANAGE_PATH
+
+
+def snapshot():
+    """Выгружаемые поля всех таблиц, кроме дат, проставляемых при вставке."""
+    return {
+        table: list(model.objects.order_by('pk').values_list(*(
+            attname for _, attname in columns if attname != 'pub_date'
+        )))
+        for table, (model, _, columns) in EXPORT_TABLES.items()
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ExportData:
+
+    EXPORT_URL_TEMPLATE = '/api/v1/export/{table}/'
+
+    def test_01_export_import_round_trip(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(MANAGE_PATH)
+        call_command('import_data', stdout=StringIO())
+        before = snapshot()
+        data_dir = tmp_path / 'static' / 'data'
+        call_command(
+            'export_data', '--output-dir', str(data_dir), '--chunk-size', '7',
+            stdout=StringIO()
+        )
+        for model, _, _ in reversed(EXPORT_TABLES.values()):
+            model.objects.all().delete()
+
+        monkeypatch.chdir(tmp_path)
+        call_command('import_data', stdout=StringIO())
+        assert snapshot() == before, (
+            'Проверьте, что файлы команды `export_data` загружаются '
+            'командой `import_data` без потерь.'
+        )
+
+    def test_02_export_ndjson_file(self, tmp_path, admin):
+        call_command(
+            'export_data', '--format', 'ndjson', '--tables', 'users',
+            '--output-dir', str(tmp_path), stdout=StringIO()
+        )
+        with open(os.path.join(tmp_path, 'users.ndjson')) as file:
+            rows = [json.loads(line) for line in file]
+        assert [row['username'] for row in rows] == [admin.username]
+
+    def test_03_export_endpoint(self, client, user_client, admin_client,
+                                admin):
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        url = self.EXPORT_URL_TEMPLATE.format(table='genre')
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN
+
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            f'Проверьте, что `{self.EXPORT_URL_TEMPLATE}` отдаёт выгрузку '
+            'потоком.'
+        )
+        content = b''.join(response.streaming_content).decode()
+        assert content.splitlines() == [
+            'id,name,slug', f'{genre.id},Драма,drama'
+        ]
+
+        response = admin_client.get(f'{url}?export_format=ndjson')
+        content = b''.join(response.streaming_content).decode()
+        assert json.loads(content) == {
+            'id': genre.id, 'name': 'Драма', 'slug': 'drama'
+        }
+
+        response = admin_client.get(f'{url}?export_format=xml')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = admin_client.get(
+            self.EXPORT_URL_TEMPLATE.format(table='unknown')
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
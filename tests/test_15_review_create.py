@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15ReviewCreate:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_duplicate_review(self, user_client, user):
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        data = {'text': 'Отзыв', 'score': 7}
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'reviews_title' in query['sql']
+        ]
+        assert len(selects) == 1, (
+            f'Проверьте, что POST-запрос к `{self.REVIEWS_URL_TEMPLATE}` '
+            'получает произведение из базы данных один раз.'
+        )
+
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'non_field_errors': [
+                'Должен быть только один отзыв от пользователя.'
+            ]
+        }
+        assert Review.objects.count() == 1
+        title.refresh_from_db()
+        assert (title.rating_count, title.rating) == (1, 7), (
+            'Проверьте, что отклонённый повторный отзыв не меняет рейтинг '
+            'произведения.'
+        )
+
+    def test_02_review_for_missing_title(self, user_client):
+        response = user_client.post(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=100500),
+            data={'text': 'Отзыв', 'score': 7}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_other_integrity_error(self, user_client, monkeypatch):
+        title = Title.objects.create(name='Произведение', year=2000)
+
+        def save(*args, **kwargs):
+            raise IntegrityError('FOREIGN KEY constraint failed')
+
+        monkeypatch.setattr(Review, 'save', save)
+        with pytest.raises(IntegrityError):
+            user_client.post(
+                self.REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+                data={'text': 'Отзыв', 'score': 7}
+            )
+        title.refresh_from_db()
+        assert title.rating_count == 0, (
+            'Проверьте, что только нарушение уникальности отзыва '
+            'считается повторным отзывом, а остальные ошибки '
+            'целостности не скрываются.'
+        )
@@ -0,0 +1,53 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Review, Title
+
+
+def count_selects(queries, table):
+    return len([
+        query for query in queries
+        if query['sql'].startswith('SELECT') and f'FROM "{table}"'
+        in query['sql']
+    ])
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16NestedParent:
+
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_parent_resolved_once(self, user_client, user):
+        title = Title.objects.create(name='Произведение', year=2000)
+        other_title = Title.objects.create(name='Другое', year=2000)
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=5
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title.id, review_id=review.id
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert count_selects(
+            context.captured_queries, 'reviews_review'
+        ) == 1, (
+            f'Проверьте, что POST-запрос к `{self.COMMENTS_URL_TEMPLATE}` '
+            'получает отзыв из базы данных один раз.'
+        )
+
+        response = user_client.post(
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=other_title.id, review_id=review.id
+            ),
+            data={'text': 'Комментарий'}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что отзыв ищется с учётом `title_id` из URL.'
+        )
@@ -0,0 +1,59 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def user_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    return response, [
+        query for query in context.captured_queries
+        if 'FROM "users_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17CachedAuthentication:
+
+    USERS_URL = '/api/v1/users/'
+    USERS_ME_URL = '/api/v1/users/me/'
+
+    def test_01_user_loaded_once(self, admin_client, admin):
+        response, _ = user_queries(admin_client, self.USERS_URL)
+        assert response.status_code == HTTPStatus.OK
+
+        response, queries = user_queries(admin_client, '/api/v1/categories/')
+        assert response.status_code == HTTPStatus.OK
+        assert not queries, (
+            'Проверьте, что пользователь из JWT-токена берётся из кэша, '
+            'а не загружается из базы данных на каждый запрос.'
+        )
+
+    def test_02_role_change_invalidates_cache(self, user_client, user,
+                                              admin_client):
+        response = user_client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        response = admin_client.patch(
+            f'{self.USERS_URL}{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = user_client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение пользователя сбрасывает его снимок '
+            'в кэше аутентификации.'
+        )
+
+    def test_03_me_returns_full_profile(self, user_client, user):
+        user_client.get(self.USERS_ME_URL)
+        response = user_client.get(self.USERS_ME_URL)
+        assert response.json() == {
+            'username': user.username,
+            'email': user.email,
+            'first_name': '',
+            'last_name': '',
+            'bio': user.bio,
+            'role': user.role,
+        }
@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+def get_token(client, user):
+    response = client.post('/api/v1/auth/token/', data={
+        'username': user.username,
+        'confirmation_code': default_token_generator.make_token(user),
+    })
+    assert response.status_code == HTTPStatus.OK
+    return response.json()['token']
+
+
+def get_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18RoleClaims:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    USERS_URL = '/api/v1/users/'
+
+    def test_01_claims_disabled_by_default(self, client, admin):
+        token = AccessToken(get_token(client, admin))
+        assert 'role' not in token, (
+            'Проверьте, что без настройки JWT_ROLE_CLAIMS роль не '
+            'добавляется в токен.'
+        )
+
+    def test_02_claims_in_token(self, client, admin, settings):
+        settings.JWT_ROLE_CLAIMS = True
+        token = AccessToken(get_token(client, admin))
+        assert token['role'] == admin.role
+        assert token['username'] == admin.username
+        assert token['is_superuser'] is admin.is_superuser
+        assert 'is_admin' not in token, (
+            'Проверьте, что флаг администратора не дублирует роль в токене.'
+        )
+
+    def test_03_permissions_without_user_query(self, client, admin,
+                                               settings):
+        settings.JWT_ROLE_CLAIMS = True
+        admin_client = get_client(get_token(client, admin))
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                self.CATEGORIES_URL, data={'name': 'Фильм', 'slug': 'films'}
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        assert not [
+            query for query in context.captured_queries
+            if 'FROM "users_user"' in query['sql']
+        ], (
+            'Проверьте, что права по токену с ролью проверяются без '
+            'загрузки пользователя из базы данных.'
+        )
+
+    def test_04_author_from_claims(self, client, user, settings):
+        settings.JWT_ROLE_CLAIMS = True
+        user_client = get_client(get_token(client, user))
+        response = user_client.get('/api/v1/users/me/')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['email'] == user.email
+
+    def test_05_users_checked_in_database(self, client, admin, settings):
+        settings.JWT_ROLE_CLAIMS = True
+        admin_client = get_client(get_token(client, admin))
+        admin.role = 'user'
+        admin.save()
+
+        response = admin_client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что управление пользователями проверяет роль по '
+            'базе данных, а не по токену.'
+        )
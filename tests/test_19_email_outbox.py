@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+
+from users.mail import get_queue_depth
+from users.models import OutgoingEmail
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+
+
+def signup(client, username):
+    response = client.post(SIGNUP_URL, data={
+        'username': username,
+        'email': f'{username}@yamdb.fake',
+    })
+    assert response.status_code == HTTPStatus.OK
+    return response
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19EmailOutbox:
+
+    def test_01_signup_enqueues_email(self, client, settings):
+        settings.EMAIL_OUTBOX = True
+        signup(client, 'first')
+        assert not mail.outbox, (
+            'Проверьте, что при включённой очереди письмо не отправляется '
+            'во время запроса регистрации.'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == 'first@yamdb.fake'
+        assert email.sent_at is None
+        assert get_queue_depth() == 1
+
+    def test_02_command_sends_batches(self, client, settings,
+                                      monkeypatch):
+        settings.EMAIL_OUTBOX = True
+        for username in ('first', 'second', 'third'):
+            signup(client, username)
+        connections = []
+        original_open = EmailBackend.open
+
+        def counting_open(backend):
+            connections.append(backend)
+            return original_open(backend)
+
+        monkeypatch.setattr(EmailBackend, 'open', counting_open)
+        call_command('send_emails', batch_size=2)
+
+        assert len(mail.outbox) == 3
+        assert len(connections) == 1, (
+            'Проверьте, что все пачки писем отправляются через одно '
+            'соединение с почтовым сервером.'
+        )
+        assert get_queue_depth() == 0
+        assert not OutgoingEmail.objects.filter(sent_at__isnull=True).exists()
+
+    def test_03_failed_email_retried(self, client, settings, monkeypatch):
+        settings.EMAIL_OUTBOX = True
+        settings.EMAIL_OUTBOX_RETRY_DELAY = 0
+        signup(client, 'first')
+
+        def failing_send(backend, messages):
+            raise ConnectionRefusedError('Сервер недоступен.')
+
+        with monkeypatch.context() as patch:
+            patch.setattr(EmailBackend, 'send_messages', failing_send)
+            call_command('send_emails')
+        email = OutgoingEmail.objects.get()
+        assert email.sent_at is None
+        assert email.attempts == 1
+        assert 'Сервер недоступен.' in email.last_error
+
+        call_command('send_emails')
+        email.refresh_from_db()
+        assert email.sent_at is not None, (
+            'Проверьте, что неотправленное письмо отправляется повторно.'
+        )
+        assert len(mail.outbox) == 1
+
+    def test_04_attempts_limit(self, client, settings, monkeypatch):
+        settings.EMAIL_OUTBOX = True
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 1
+        signup(client, 'first')
+
+        def failing_send(backend, messages):
+            raise OSError('Сервер недоступен.')
+
+        monkeypatch.setattr(EmailBackend, 'send_messages', failing_send)
+        call_command('send_emails')
+        call_command('send_emails')
+        assert OutgoingEmail.objects.get().attempts == 1
+        assert get_queue_depth() == 0
@@ -0,0 +1,68 @@
+import re
+
+import pytest
+from django.contrib.auth.tokens import default_token_generator
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+
+from users.mail import dispatch_emails
+from users.models import OutgoingEmail
+
+
+@pytest.fixture
+def opened_connections(monkeypatch):
+    connections = []
+    original_open = EmailBackend.open
+
+    def counting_open(backend):
+        connections.append(backend)
+        return original_open(backend)
+
+    monkeypatch.setattr(EmailBackend, 'open', counting_open)
+    return connections
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20MassMail:
+
+    ADMIN_USERS_URL = '/admin/users/user/'
+
+    def test_01_dispatch_uses_one_connection(self, opened_connections):
+        emails = [
+            ('Тема', f'Текст {number}', f'user{number}@yamdb.fake')
+            for number in range(5)
+        ]
+        assert dispatch_emails(emails, batch_size=2) == 5
+        assert len(mail.outbox) == 5
+        assert len(opened_connections) == 1, (
+            'Проверьте, что все пачки писем отправляются через одно '
+            'соединение с почтовым сервером.'
+        )
+
+    def test_02_dispatch_to_outbox(self, settings):
+        settings.EMAIL_OUTBOX = True
+        emails = [('Тема', 'Текст', f'user{n}@yamdb.fake') for n in range(3)]
+        assert dispatch_emails(emails) == 3
+        assert not mail.outbox
+        assert OutgoingEmail.objects.count() == 3
+
+    def test_03_admin_resends_codes(self, client, user_superuser, user,
+                                    moderator, opened_connections):
+        client.force_login(user_superuser)
+        response = client.post(self.ADMIN_USERS_URL, data={
+            'action': 'resend_confirmation_codes',
+            '_selected_action': [user.pk, moderator.pk],
+        })
+        assert response.status_code == 302
+
+        assert sorted(email.to[0] for email in mail.outbox) == sorted(
+            (user.email, moderator.email)
+        )
+        assert len(opened_connections) == 1
+        for email in mail.outbox:
+            recipient = user if email.to[0] == user.email else moderator
+            code = re.search(r'код: (\S+)', email.body).group(1)
+            assert default_token_generator.check_token(recipient, code), (
+                'Проверьте, что повторно отправленный код подтверждения '
+                'действителен.'
+            )
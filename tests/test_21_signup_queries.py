@@ -0,0 +1,61 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.views import RegisterViewSet
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21SignupQueries:
+
+    SIGNUP_URL = '/api/v1/auth/signup/'
+
+    def signup(self, client, user):
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(self.SIGNUP_URL, data={
+                'username': user.username,
+                'email': user.email,
+            })
+        return response, [
+            query for query in context.captured_queries
+            if 'users_user' in query['sql']
+        ]
+
+    def test_01_existing_user_one_query(self, client, user):
+        response, queries = self.signup(client, user)
+        assert response.status_code == HTTPStatus.OK
+        assert len(queries) == 1, (
+            'Проверьте, что пользователь при регистрации ищется по email '
+            'и username одним запросом.'
+        )
+
+    def test_02_mismatch_keeps_error(self, client, user, moderator):
+        response = client.post(self.SIGNUP_URL, data={
+            'username': user.username,
+            'email': moderator.email,
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'detail': 'email и username не совпадают ни с одним user.'
+        }
+
+    def test_03_concurrent_signup(self, client, user, monkeypatch):
+        original_find_user = RegisterViewSet.find_user
+        calls = []
+
+        def find_user(view, email, username):
+            calls.append(email)
+            if len(calls) == 1:
+                # Пользователь создан параллельным запросом после поиска.
+                return False, None
+            return original_find_user(view, email, username)
+
+        monkeypatch.setattr(RegisterViewSet, 'find_user', find_user)
+        response, _ = self.signup(client, user)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что конфликт уникальности при одновременной '
+            'регистрации обрабатывается без ошибки сервера.'
+        )
+        assert len(calls) == 2
@@ -0,0 +1,87 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.throttling import AuthRateThrottle
+
+
+@pytest.fixture
+def throttle_rates(monkeypatch):
+    rates = {
+        'auth_burst': '3/min',
+        'auth_sustained': '100/hour',
+        'auth_identity': '2/min',
+    }
+    monkeypatch.setattr(AuthRateThrottle, 'THROTTLE_RATES', rates)
+    return rates
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22AuthThrottling:
+
+    SIGNUP_URL = '/api/v1/auth/signup/'
+    TOKEN_URL = '/api/v1/auth/token/'
+
+    def signup(self, client, number, ip='10.0.0.1', username=None):
+        return client.post(
+            self.SIGNUP_URL,
+            data={
+                'username': username or f'user{number}',
+                'email': f'user{number}@yamdb.fake',
+            },
+            REMOTE_ADDR=ip
+        )
+
+    def test_01_burst_by_ip(self, client, throttle_rates):
+        for number in range(3):
+            assert self.signup(client, number).status_code == HTTPStatus.OK
+        with CaptureQueriesContext(connection) as context:
+            response = self.signup(client, 3)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что частые запросы регистрации с одного IP '
+            'ограничиваются.'
+        )
+        assert not context.captured_queries, (
+            'Проверьте, что лишние запросы отклоняются до обращения к '
+            'базе данных.'
+        )
+        response = self.signup(client, 3, ip='10.0.0.2')
+        assert response.status_code == HTTPStatus.OK
+
+    def test_02_identity_across_ips(self, client, throttle_rates):
+        for number in range(2):
+            response = self.signup(
+                client, number, ip=f'10.0.1.{number}', username='target'
+            )
+            assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS
+        response = self.signup(client, 2, ip='10.0.1.2', username='target')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что запросы для одного username ограничиваются '
+            'независимо от IP.'
+        )
+
+    def test_03_token_throttled(self, client, user, throttle_rates):
+        for number in range(2):
+            response = client.post(self.TOKEN_URL, data={
+                'username': user.username, 'confirmation_code': 'wrong'
+            }, REMOTE_ADDR=f'10.0.2.{number}')
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = client.post(self.TOKEN_URL, data={
+            'username': user.username, 'confirmation_code': 'wrong'
+        }, REMOTE_ADDR='10.0.2.2')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что подбор кода подтверждения для одного username '
+            'ограничивается.'
+        )
+
+    def test_04_non_dict_body(self, throttle_rates):
+        client = APIClient()
+        for url, data in ((self.SIGNUP_URL, []), (self.TOKEN_URL, [1])):
+            response = client.post(url, data=data, format='json')
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что POST-запрос к `{url}` с телом, не '
+                'являющимся словарём, возвращает ошибку 400.'
+            )
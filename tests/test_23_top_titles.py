@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Genre, Review, Title, TopTitle
+
+
+def create_title(name, genre, category, scores, users):
+    title = Title.objects.create(name=name, year=2000, category=category)
+    title.genre.set((genre,))
+    for score, author in zip(scores, users):
+        Review.objects.create(
+            title=title, author=author, text='Отзыв', score=score
+        )
+    return title
+
+
+@pytest.fixture
+def ranked_titles(user, moderator, admin):
+    users = (user, moderator, admin)
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    category = Category.objects.create(name='Фильм', slug='films')
+    titles = (
+        create_title('Хороший', genre, category, (8, 8, 8), users),
+        create_title('Лучший', genre, category, (10, 9, 10), users),
+        create_title('Мало отзывов', genre, category, (10,), users),
+    )
+    Title.objects.rebuild_ratings()
+    return genre, category, titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23TopTitles:
+
+    def test_01_rebuild_ranking(self, ranked_titles, settings):
+        settings.TOP_TITLES_MIN_REVIEWS = 2
+        genre, category, (good, best, _) = ranked_titles
+        call_command('rebuild_top_titles')
+        assert list(
+            genre.top_titles.values_list('title_id', flat=True)
+        ) == [best.id, good.id], (
+            'Проверьте, что рейтинг жанра упорядочен по убыванию рейтинга '
+            'и учитывает минимальное количество отзывов.'
+        )
+        assert category.top_titles.count() == 2
+
+    def test_02_min_reviews_option(self, ranked_titles):
+        genre, *_ = ranked_titles
+        call_command('rebuild_top_titles', min_reviews=1, size=1)
+        assert TopTitle.objects.filter(genre=genre).count() == 1
+        assert genre.top_titles.get().title.name == 'Мало отзывов'
+
+    def test_03_top_endpoint(self, client, ranked_titles, settings,
+                             django_assert_max_num_queries):
+        settings.TOP_TITLES_MIN_REVIEWS = 2
+        genre, category, (good, best, _) = ranked_titles
+        call_command('rebuild_top_titles')
+        client.get(f'/api/v1/genres/{genre.slug}/top/')
+        for url in (
+            f'/api/v1/genres/{genre.slug}/top/',
+            f'/api/v1/categories/{category.slug}/top/',
+        ):
+            with django_assert_max_num_queries(3):
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что эндпоинт `{url}` доступен без токена.'
+            )
+            data = response.json()
+            assert [item['name'] for item in data] == [best.name, good.name]
+            assert data[0]['rating'] == 9
+
+        response = client.get('/api/v1/genres/unknown/top/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,79 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from reviews.models import Title
+from reviews.search import FallbackTitleSearch
+from tests.conftest import MANAGE_PATH
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_ranked_results(self, client):
+        Title.objects.create(
+            name='Мастер и Маргарита', year=1967,
+            description='Роман о дьяволе в Москве.'
+        )
+        Title.objects.create(
+            name='Москва-Петушки', year=1973, description='Поэма.'
+        )
+        Title.objects.create(
+            name='Собачье сердце', year=1925, description='Повесть.'
+        )
+        assert self.search(client, 'москв') == [
+            'Москва-Петушки', 'Мастер и Маргарита'
+        ], (
+            'Проверьте, что поиск находит произведения по названию и '
+            'описанию, а совпадения в названии ранжируются выше.'
+        )
+        assert self.search(client, 'роман дьявол') == ['Мастер и Маргарита']
+        assert self.search(client, '"*)(') == []
+
+    def test_02_index_synced(self, client):
+        title = Title.objects.create(name='Старое название', year=2000)
+        title.name = 'Новое название'
+        title.save()
+        assert self.search(client, 'старое') == []
+        assert self.search(client, 'новое') == ['Новое название']
+
+        title.delete()
+        assert self.search(client, 'новое') == [], (
+            'Проверьте, что удалённое произведение удаляется из индекса.'
+        )
+
+    def test_03_import_rebuilds_index(self, client, monkeypatch):
+        monkeypatch.chdir(MANAGE_PATH)
+        call_command('import_data')
+        names = self.search(client, Title.objects.first().name)
+        assert Title.objects.first().name in names
+
+    def test_04_fallback_search(self):
+        # LIKE в SQLite не учитывает регистр только для латиницы.
+        Title.objects.create(
+            name='The Master and Margarita', year=1967,
+            description='A novel about the devil in Moscow.'
+        )
+        Title.objects.create(
+            name='Moscow-Petushki', year=1973, description='A poem.'
+        )
+        search = FallbackTitleSearch(connection)
+        search.index(Title.objects.all())
+        found = search.search(Title.objects.all(), 'MOSCOW')
+        assert [title.name for title in found] == [
+            'Moscow-Petushki', 'The Master and Margarita'
+        ], (
+            'Проверьте, что для баз данных без полнотекстового поиска '
+            'произведения ищутся по вхождению слов.'
+        )
+        assert not search.search(Title.objects.all(), 'novel poem')
+        assert not search.search(Title.objects.all(), '"*)(')
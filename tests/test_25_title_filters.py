@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.fixture
+def catalog():
+    genres = {
+        slug: Genre.objects.create(name=slug, slug=slug)
+        for slug in ('drama', 'comedy', 'rock', 'hard-rock')
+    }
+    films = Category.objects.create(name='Фильм', slug='films')
+    music = Category.objects.create(name='Музыка', slug='music')
+    titles = {}
+    for name, category, title_genres in (
+        ('Драма', films, ('drama',)),
+        ('Трагикомедия', films, ('drama', 'comedy')),
+        ('Комедия', films, ('comedy',)),
+        ('Рок', music, ('rock',)),
+        ('Хард-рок', music, ('hard-rock',)),
+    ):
+        titles[name] = Title.objects.create(
+            name=name, year=2000, category=category
+        )
+        titles[name].genre.set([genres[slug] for slug in title_genres])
+    return titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25TitleFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_names(self, client, params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return sorted(title['name'] for title in response.json()['results'])
+
+    def test_01_exact_genre(self, client, catalog):
+        assert self.get_names(client, {'genre': 'rock'}) == ['Рок'], (
+            'Проверьте, что фильтр `genre` сравнивает slug точно.'
+        )
+        assert self.get_names(client, {'genre__icontains': 'rock'}) == [
+            'Рок', 'Хард-рок'
+        ]
+
+    def test_02_multiple_genres(self, client, catalog):
+        assert self.get_names(client, {'genre': 'drama,comedy'}) == [
+            'Драма', 'Комедия', 'Трагикомедия'
+        ]
+        assert self.get_names(
+            client, {'genre': 'drama,comedy', 'genre_match': 'all'}
+        ) == ['Трагикомедия'], (
+            'Проверьте, что `genre_match=all` оставляет произведения со '
+            'всеми указанными жанрами.'
+        )
+        assert self.get_names(
+            client, {'genre': 'drama,unknown', 'genre_match': 'all'}
+        ) == []
+
+    def test_03_categories(self, client, catalog):
+        assert self.get_names(client, {'category': 'music'}) == [
+            'Рок', 'Хард-рок'
+        ]
+        assert len(self.get_names(client, {'category': 'films,music'})) == 5
+        assert self.get_names(client, {'category__icontains': 'mus'}) == [
+            'Рок', 'Хард-рок'
+        ]
+
+    def test_04_no_slug_joins(self, client, catalog):
+        with CaptureQueriesContext(connection) as context:
+            self.get_names(client, {'genre': 'drama,comedy'})
+        title_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'COUNT(*)' in query['sql']
+        ]
+        assert title_queries
+        assert all('reviews_genre' not in sql for sql in title_queries), (
+            'Проверьте, что slug жанров переводятся в id до выборки '
+            'произведений.'
+        )
@@ -0,0 +1,89 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+
+from reviews.models import Category, Title
+
+
+@pytest.fixture
+def titles():
+    films = Category.objects.create(name='Фильм', slug='films')
+    books = Category.objects.create(name='Книга', slug='books')
+    data = (
+        ('Старый', 1990, films, 8),
+        ('Средний', 2005, films, 6),
+        ('Лучший', 2008, films, 9),
+        ('Книга', 2006, books, 10),
+        ('Без оценок', 2007, films, None),
+    )
+    for name, year, category, rating in data:
+        title = Title.objects.create(name=name, year=year, category=category)
+        if rating is not None:
+            Title.objects.apply_score(title.id, rating, 1)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26TitleRanges:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_names(self, client, params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        return sorted(title['name'] for title in response.json()['results'])
+
+    def test_01_year_range(self, client, titles):
+        assert self.get_names(
+            client, {'year_min': 2000, 'year_max': 2007}
+        ) == ['Без оценок', 'Книга', 'Средний']
+
+    def test_02_rating_range(self, client, titles):
+        assert self.get_names(client, {'rating_min': 8}) == [
+            'Книга', 'Лучший', 'Старый'
+        ]
+        assert self.get_names(
+            client, {'rating_min': 7, 'rating_max': 9}
+        ) == ['Лучший', 'Старый'], (
+            'Проверьте, что произведения фильтруются по диапазону рейтинга.'
+        )
+
+    def test_03_combined(self, client, titles):
+        assert self.get_names(client, {
+            'category': 'films',
+            'year_min': 2000,
+            'year_max': 2010,
+            'rating_min': 7,
+        }) == ['Лучший']
+
+    def test_04_range_uses_index(self, titles):
+        queryset = Title.objects.filter(
+            category=Category.objects.get(slug='films'),
+            year__gte=2000,
+            year__lte=2010
+        )
+        with connection.cursor() as cursor:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+        assert 'title_category_year_idx' in plan, (
+            'Проверьте, что для фильтра по категории и годам создан '
+            'составной индекс.'
+        )
+
+    def test_05_rating_range_not_stale(self, client, user_client, titles):
+        assert self.get_names(client, {'rating_min': 9}) == [
+            'Книга', 'Лучший'
+        ]
+        title = Title.objects.get(name='Без оценок')
+        response = user_client.post(
+            f'{self.TITLES_URL}{title.id}/reviews/',
+            data={'text': 'Отзыв', 'score': 10}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert self.get_names(client, {'rating_min': 9}) == [
+            'Без оценок', 'Книга', 'Лучший'
+        ], (
+            'Проверьте, что новый отзыв сбрасывает кэш списков '
+            'произведений с фильтром по рейтингу.'
+        )
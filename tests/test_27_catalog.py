@@ -0,0 +1,123 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.catalog import catalog
+from reviews.models import Category, Genre
+
+
+def catalog_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and ('"reviews_category"' in query['sql']
+             or 'FROM "reviews_genre"' in query['sql'])
+    ]
+
+
+@pytest.fixture
+def catalog_items():
+    Category.objects.create(name='Фильм', slug='films')
+    Genre.objects.create(name='Драма', slug='drama')
+    Genre.objects.create(name='Комедия', slug='comedy')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27Catalog:
+
+    TITLES_URL = '/api/v1/titles/'
+    data = {
+        'name': 'Произведение',
+        'year': 2000,
+        'genre': ['drama', 'comedy'],
+        'category': 'films',
+    }
+
+    def test_01_title_write_uses_catalog(self, admin_client, catalog_items):
+        catalog.get_entries()
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(self.TITLES_URL, data=self.data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['category'] == {
+            'name': 'Фильм', 'slug': 'films'
+        }
+        assert not [
+            sql for sql in catalog_queries(context)
+            if 'reviews_title_genre' not in sql
+        ], (
+            'Проверьте, что slug категорий и жанров при записи '
+            'произведения берутся из справочника без запросов к базе.'
+        )
+
+    def test_02_catalog_invalidated(self, admin_client, client,
+                                    catalog_items):
+        response = admin_client.post(self.TITLES_URL, data=self.data)
+        title_id = response.json()['id']
+        category = Category.objects.get(slug='films')
+        category.name = 'Кино'
+        category.save()
+
+        response = client.get(f'{self.TITLES_URL}{title_id}/')
+        assert response.json()['category']['name'] == 'Кино', (
+            'Проверьте, что изменение категории сбрасывает справочник.'
+        )
+
+    def test_03_new_genre_available(self, admin_client, catalog_items):
+        catalog.get_entries()
+        Genre.objects.create(name='Рок', slug='rock')
+        response = admin_client.post(
+            self.TITLES_URL, data={**self.data, 'genre': ['rock']}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['genre'] == [{'name': 'Рок', 'slug': 'rock'}]
+
+    def test_04_unknown_slug(self, admin_client, catalog_items):
+        response = admin_client.post(
+            self.TITLES_URL, data={**self.data, 'category': 'unknown'}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'category' in response.json()
+
+    def test_05_deleted_genre(self, admin_client, catalog_items):
+        catalog.get_entries()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'DELETE FROM reviews_genre WHERE slug = %s', ['comedy']
+            )
+        response = admin_client.post(self.TITLES_URL, data=self.data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что жанр, удалённый в обход справочника, '
+            'приводит к ошибке 400, а не 500.'
+        )
+        response = admin_client.post(self.TITLES_URL, data=self.data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'genre' in response.json(), (
+            'Проверьте, что после ошибки справочник перечитывается.'
+        )
+
+    def test_06_miss_reload_interval(self, client, settings, catalog_items):
+        settings.CATALOG_MISS_RELOAD_INTERVAL = 60
+        catalog.get_entries()
+        with CaptureQueriesContext(connection) as context:
+            for slug in ('unknown', 'missing', 'absent'):
+                client.get(self.TITLES_URL, {'genre': slug})
+        assert len(catalog_queries(context)) <= 2, (
+            'Проверьте, что промах по slug перечитывает справочник '
+            'не чаще раза в CATALOG_MISS_RELOAD_INTERVAL секунд.'
+        )
+
+    def test_07_max_age(self, settings, catalog_items):
+        settings.CATALOG_MAX_AGE = 0
+        catalog.get_entries()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'UPDATE reviews_genre SET name = %s WHERE slug = %s',
+                ['Трагедия', 'drama']
+            )
+        genre, = catalog.get_by_slugs(Genre, ('drama',))
+        assert genre.name == 'Трагедия', (
+            'Проверьте, что снимок справочника перечитывается '
+            'по истечении CATALOG_MAX_AGE.'
+        )
@@ -0,0 +1,158 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.fixture
+def catalog_items():
+    Category.objects.create(name='Фильм', slug='films')
+    Category.objects.create(name='Книга', slug='books')
+    Genre.objects.create(name='Драма', slug='drama')
+    Genre.objects.create(name='Комедия', slug='comedy')
+
+
+def title_data(name, genre=('drama',), category='films'):
+    return {
+        'name': name,
+        'year': 2000,
+        'genre': list(genre),
+        'category': category,
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28TitleBulk:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def test_01_bulk_create(self, admin_client, catalog_items):
+        data = [
+            title_data(f'Произведение {number}', ('drama', 'comedy'))
+            for number in range(5)
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                self.BULK_URL, data=data, format='json'
+            )
+        assert response.status_code == HTTPStatus.CREATED, response.json()
+        results = response.json()
+        assert [item['status'] for item in results] == ['created'] * 5
+        assert Title.objects.count() == 5
+        assert Title.genre.through.objects.count() == 10
+
+        sql = [query['sql'] for query in context.captured_queries]
+        link_inserts = [
+            query for query in sql
+            if query.startswith('INSERT INTO "reviews_title_genre"')
+        ]
+        assert len(link_inserts) == 1, (
+            'Проверьте, что связи произведений с жанрами сохраняются '
+            'одним запросом.'
+        )
+        slug_queries = [
+            query for query in sql
+            if query.startswith('SELECT') and 'FROM "reviews_genre"' in query
+        ]
+        assert len(slug_queries) <= 1, (
+            'Проверьте, что slug всех произведений пакета проверяются '
+            'одним запросом.'
+        )
+
+    def test_02_bulk_update(self, admin_client, catalog_items):
+        response = admin_client.post(
+            self.BULK_URL,
+            data=[title_data('Первое'), title_data('Второе')],
+            format='json'
+        )
+        first_id, second_id = (item['id'] for item in response.json())
+
+        response = admin_client.post(self.BULK_URL, data=[
+            {'id': first_id, 'name': 'Первое изменённое',
+             'genre': ['comedy'], 'category': 'books'},
+            title_data('Третье'),
+            {'id': second_id, 'year': 1999},
+        ], format='json')
+        assert response.status_code == HTTPStatus.CREATED, response.json()
+        assert [item['status'] for item in response.json()] == [
+            'updated', 'created', 'updated'
+        ]
+
+        first = Title.objects.get(pk=first_id)
+        assert first.name == 'Первое изменённое'
+        assert first.category.slug == 'books'
+        assert list(first.genre.values_list('slug', flat=True)) == ['comedy']
+        second = Title.objects.get(pk=second_id)
+        assert second.year == 1999
+        assert list(
+            second.genre.values_list('slug', flat=True)
+        ) == ['drama']
+
+        response = admin_client.get(f'/api/v1/titles/{first_id}/')
+        assert response.json()['name'] == 'Первое изменённое'
+
+    def test_03_errors_rollback(self, admin_client, catalog_items):
+        response = admin_client.post(self.BULK_URL, data=[
+            title_data('Хорошее'),
+            title_data('Плохое', genre=('unknown',)),
+            {'id': 100500, 'name': 'Нет такого'},
+        ], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert errors[0] == {}
+        assert 'genre' in errors[1]
+        assert 'id' in errors[2]
+        assert not Title.objects.exists(), (
+            'Проверьте, что при ошибке в элементе пакета ничего не '
+            'сохраняется.'
+        )
+
+    def test_04_permissions(self, user_client, catalog_items):
+        data = [title_data('Произведение')]
+        response = APIClient().post(self.BULK_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        response = user_client.post(self.BULK_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_05_invalid_payload(self, admin_client):
+        response = admin_client.post(
+            self.BULK_URL, data={'name': 'Не список'}, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_06_duplicate_genres(self, admin_client, catalog_items):
+        response = admin_client.post(self.BULK_URL, data=[
+            title_data('Произведение', genre=('drama', 'drama')),
+        ], format='json')
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что повторяющиеся slug жанров в элементе пакета '
+            'сохраняются одной связью.'
+        )
+        title = Title.objects.get()
+        assert list(title.genre.values_list('slug', flat=True)) == ['drama']
+
+    def test_07_duplicate_ids(self, admin_client, catalog_items):
+        response = admin_client.post(
+            self.BULK_URL, data=[title_data('Первое')], format='json'
+        )
+        title_id = response.json()[0]['id']
+        response = admin_client.post(self.BULK_URL, data=[
+            {'id': title_id, 'genre': ['comedy']},
+            {'id': title_id, 'genre': ['comedy']},
+        ], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторяющийся `id` в пакете возвращает ошибку '
+            'элемента.'
+        )
+        errors = response.json()
+        assert errors[0] == {}
+        assert 'id' in errors[1]
+        assert list(
+            Title.objects.get(pk=title_id).genre.values_list(
+                'slug', flat=True
+            )
+        ) == ['drama']